@@ -0,0 +1,93 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+import tracing
+from core import validate_scores
+
+INPUT_COLUMNS = ['RATAAN', 'S.BAKU']
+
+
+def read_chunks(file, file_name, chunk_size=10000):
+    # Membaca file unggahan per potongan agar seluruh isi tidak perlu dimuat sekaligus
+    if file_name.lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(file)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(file, chunksize=chunk_size)
+
+
+def score_chunk(chunk, predictor, recommender, k=5):
+    # Satu panggilan predict untuk seluruh baris valid dalam potongan
+    rataan, sbaku, reasons = validate_scores(chunk['RATAAN'], chunk['S.BAKU'])
+    valid = reasons == ""
+
+    predictions = np.full(len(chunk), np.nan)
+    if valid.any():
+        predictions[valid] = predictor.predict(np.column_stack([rataan[valid], sbaku[valid]]))
+
+    result = chunk.copy()
+    result['PREDIKSI_MIN'] = np.round(predictions, 2)
+    if recommender is not None and k > 0:
+        # Kolom rekomendasi selalu ditulis agar header tiap potongan konsisten
+        n_recommendations = min(k, len(recommender))
+        names = np.full((len(chunk), n_recommendations), None, dtype=object)
+        mins = np.full((len(chunk), n_recommendations), np.nan)
+        if valid.any():
+            positions, _ = recommender.nearest_min_batch(predictions[valid], n_recommendations)
+            names[valid] = recommender.names(positions)
+            mins[valid] = recommender.mins(positions)
+        for i in range(n_recommendations):
+            result[f'REKOMENDASI_{i + 1}'] = names[:, i]
+            result[f'MIN_REKOMENDASI_{i + 1}'] = mins[:, i]
+    result['KETERANGAN'] = reasons
+    return result, int(valid.sum())
+
+
+def run_batch(file, file_name, out, predictor, recommender, k=5, chunk_size=10000, progress=None):
+    # Memproses file potongan demi potongan dan menulis hasilnya langsung ke `out`
+    # (file teks terbuka) sehingga input maupun output tidak pernah utuh di memori.
+    stats = {'rows': 0, 'valid': 0, 'invalid': 0, 'seconds': 0.0, 'rows_per_sec': 0.0}
+    start = time.perf_counter()
+    for i, chunk in enumerate(read_chunks(file, file_name, chunk_size)):
+        missing = [column for column in INPUT_COLUMNS if column not in chunk.columns]
+        if missing:
+            raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(missing)}")
+
+        with tracing.span('batch/chunk', rows=len(chunk)):
+            result, n_valid = score_chunk(chunk, predictor, recommender, k)
+            result.to_csv(out, header=(i == 0), index=False)
+
+        stats['rows'] += len(chunk)
+        stats['valid'] += n_valid
+        stats['invalid'] += len(chunk) - n_valid
+        stats['seconds'] = time.perf_counter() - start
+        stats['rows_per_sec'] = stats['rows'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+        if progress is not None:
+            progress(stats)
+    return stats
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from core import load_predictor
+    from loader import load_recommender
+
+    parser = argparse.ArgumentParser(description="Prediksi passing grade massal dari file CSV/Parquet")
+    parser.add_argument('input', help="File CSV atau Parquet dengan kolom RATAAN dan S.BAKU")
+    parser.add_argument('output', help="File CSV hasil prediksi")
+    parser.add_argument('--k', type=int, default=5, help="Jumlah rekomendasi per baris")
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    with open(args.input, 'rb') as f, open(args.output, 'w', newline='') as out:
+        stats = run_batch(
+            f, args.input, out,
+            load_predictor('Lasso_Regression.sav', 'polynomial_features.sav'), load_recommender('passing-grade.csv'), k=args.k, chunk_size=args.chunk_size,
+            progress=lambda s: print(f"{s['rows']} baris ({s['rows_per_sec']:.0f} baris/detik)"),
+        )
+    print(f"Selesai: {stats['valid']} valid, {stats['invalid']} tidak valid, {stats['seconds']:.2f} detik")
@@ -0,0 +1,272 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Benchmark tanpa antarmuka untuk aplikasi passing grade: latensi rerun setiap
+# halaman menu (lewat streamlit AppTest), prediksi tunggal dan massal, pencarian
+# rekomendasi, dan pelatihan "Latih Model", beserta puncak memori. Dataset
+# sintetis dengan skema passing-grade.csv dibuat untuk beberapa ukuran agar
+# kurva skalanya terlihat. Hasil ditulis sebagai JSON dan bisa dibandingkan
+# dengan baseline.
+#
+#   python benchmark.py --sizes 500 50000 --out bench.json
+#   python benchmark.py --sizes 500 50000 --baseline bench.json --threshold 0.25
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_FILES = ['Lasso_Regression.sav', 'Lasso_Regression.json', 'polynomial_features.sav', 'fotoptn.jpg', 'team_icon.png']
+PAGES = ["Home", "Lihat Dataset", "Tampilkan Grafik", "Prediksi Passing Grade", "Prediksi Massal", "Modelling"]
+DEFAULT_SIZES = [500, 50_000, 1_000_000]
+
+
+def synthetic_dataset(n, seed=42, source=os.path.join(APP_DIR, 'passing-grade.csv')):
+    # Nama PTN/prodi diambil dari dataset asli, nilai dibangkitkan dengan
+    # sebaran dan hubungan yang mirip (MIN ~ RATAAN - k * S.BAKU)
+    real = pd.read_csv(source)
+    rng = np.random.default_rng(seed)
+    rataan = np.clip(rng.normal(real['RATAAN'].mean(), real['RATAAN'].std(), n), 400, 800)
+    sbaku = np.clip(rng.normal(real['S.BAKU'].mean(), real['S.BAKU'].std(), n), 1, 30)
+    return pd.DataFrame({
+        'NO': np.arange(1, n + 1),
+        'PTN': rng.choice(real['PTN'].unique(), n),
+        'KODE PRODI': rng.integers(1_000_000, 9_999_999, n),
+        'NAMA PRODI': rng.choice(real['NAMA PRODI'].unique(), n),
+        'RATAAN': rataan.round(2),
+        'S.BAKU': sbaku.round(2),
+        'MIN': (rataan - 1.2 * sbaku + rng.normal(0, 2, n)).round(2),
+        'MAX': (rataan + 2.5 * sbaku + rng.normal(0, 5, n)).round(2),
+    })
+
+
+def measure(fn, repeat=5, warmup=1):
+    # Latensi (median/p95) tanpa tracemalloc, lalu satu putaran terpisah
+    # dengan tracemalloc untuk puncak memori Python
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'median_ms': statistics.median(timings),
+        'p95_ms': float(np.percentile(timings, 95)),
+        'peak_mb': peak / 2**20,
+    }
+
+
+def measure_once(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        fn()
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {'cold_ms': elapsed, 'peak_mb': peak / 2**20}
+
+
+def prepare_workspace(df):
+    # Aplikasi membaca file relatif terhadap direktori kerja, jadi benchmark
+    # menjalankannya di direktori sementara berisi dataset sintetis
+    workspace = tempfile.mkdtemp(prefix='passing-grade-bench-')
+    for name in APP_FILES:
+        source = os.path.join(APP_DIR, name)
+        if os.path.exists(source):
+            os.symlink(source, os.path.join(workspace, name))
+    df.to_csv(os.path.join(workspace, 'passing-grade.csv'), index=False)
+    return workspace
+
+
+def bench_pages(repeat, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    app = AppTest.from_file(os.path.join(APP_DIR, 'passing_grade.py'), default_timeout=timeout)
+    started = [False]
+
+    def rerun(page, select=False):
+        if select and started[0]:
+            app.sidebar.selectbox[0].select(page).run()
+        else:
+            app.run()
+            started[0] = True
+        if app.exception:
+            raise RuntimeError(f"Halaman {page} gagal: {app.exception[0].value}")
+
+    for page in PAGES:
+        cold = measure_once(lambda: rerun(page, select=True))
+        warm = measure(lambda: rerun(page), repeat=repeat, warmup=0)
+        results[page] = {**warm, 'cold_ms': cold['cold_ms'], 'cold_peak_mb': cold['peak_mb']}
+
+    # Rerun halaman prediksi dengan tombol "Prediksi" ditekan
+    app.sidebar.selectbox[0].select("Prediksi Passing Grade").run()
+    app.number_input[0].set_value(700)
+    app.number_input[1].set_value(20)
+    app.text_input[0].input("Universitas Indonesia")
+    app.text_input[1].input("Pendidikan Dokter")
+    results['Prediksi Passing Grade (klik)'] = measure(lambda: app.button[0].click().run(), repeat=repeat)
+    return results
+
+
+def bench_prediction(repeat):
+    from core import load_predictor
+    from loader import load_lookup
+
+    results = {}
+    rng = np.random.default_rng(0)
+    batch = np.column_stack([rng.uniform(1, 800, 10_000), rng.uniform(1, 30, 10_000)])
+    results['lookup/build'] = measure_once(lambda: load_lookup('passing-grade.csv'))
+    predictors = {
+        'lookup': load_lookup('passing-grade.csv'),
+        'compiled': load_predictor(artifact_path='Lasso_Regression.json'),
+        'sklearn': load_predictor(),
+    }
+    for name, predictor in predictors.items():
+        results[f'{name}/single'] = measure(lambda: predictor.predict_one(700, 20), repeat=max(repeat, 100))
+        results[f'{name}/batch_10k'] = measure(lambda: predictor.predict(batch), repeat=repeat)
+    # Baris bulat (seperti input halaman prediksi) langsung diambil dari tabel
+    results['lookup/batch_10k_integer'] = measure(lambda: predictors['lookup'].predict(batch.round()), repeat=repeat)
+    return results
+
+
+def bench_recommendation(repeat):
+    from loader import clear_cache, load_recommender
+
+    clear_cache()
+    results = {'build': measure_once(lambda: load_recommender('passing-grade.csv'))}
+    recommender = load_recommender('passing-grade.csv')
+    targets = np.random.default_rng(1).uniform(550, 750, 10_000)
+    results['nearest_min'] = measure(lambda: recommender.nearest_min(650.0, k=5), repeat=max(repeat, 50))
+    results['nearest_min_filtered'] = measure(
+        lambda: recommender.nearest_min(650.0, k=5, ptn='Universitas Indonesia'), repeat=max(repeat, 50))
+    results['nearest_profile'] = measure(
+        lambda: recommender.nearest_profile(700.0, 20.0, 650.0, k=5), repeat=max(repeat, 50))
+    results['nearest_min_batch_10k'] = measure(lambda: recommender.nearest_min_batch(targets, k=5), repeat=repeat)
+    return results
+
+
+def bench_training(df, max_rows):
+    from training import TrainingJob
+
+    if len(df) > max_rows:
+        df = df.sample(max_rows, random_state=0)
+    job = TrainingJob(df, model_path='bench_model.sav', poly_path='bench_poly.sav')
+    result = measure_once(lambda: job.start().wait())
+    if job.error is not None:
+        raise job.error
+    result['rows'] = len(df)
+    result['per_model'] = {
+        name: {'wall_seconds': p['wall_seconds'], 'cpu_seconds': p['cpu_seconds'], 'mse': p['mse']}
+        for name, p in job.progress().items()
+    }
+    return result
+
+
+def run(sizes, repeat=5, timeout=600, train_max_rows=50_000, skip=()):
+    sys.path.insert(0, APP_DIR)
+    results = {}
+    cwd = os.getcwd()
+    for size in sizes:
+        df = synthetic_dataset(size)
+        workspace = prepare_workspace(df)
+        os.chdir(workspace)
+        try:
+            from loader import clear_cache
+            clear_cache()
+            section = {}
+            if 'pages' not in skip:
+                section['pages'] = bench_pages(repeat, timeout)
+            if 'prediction' not in skip:
+                section['prediction'] = bench_prediction(repeat)
+            if 'recommendation' not in skip:
+                section['recommendation'] = bench_recommendation(repeat)
+            if 'training' not in skip:
+                section['training'] = bench_training(df, train_max_rows)
+            results[str(size)] = section
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(workspace, ignore_errors=True)
+        print(f"ukuran {size:,} selesai", file=sys.stderr)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': repeat,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def flatten(tree, prefix=''):
+    flat = {}
+    for key, value in tree.items():
+        path = f'{prefix}/{key}' if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        elif isinstance(value, (int, float)):
+            flat[path] = value
+    return flat
+
+
+def compare(current, baseline, threshold):
+    # Metrik waktu (*_ms) dan memori (*_mb) yang naik lebih dari `threshold`
+    current = flatten(current['results'])
+    baseline = flatten(baseline['results'])
+    regressions = []
+    for key, before in sorted(baseline.items()):
+        after = current.get(key)
+        if after is None or not key.endswith(('_ms', '_mb')) or before <= 0:
+            continue
+        if after > before * (1 + threshold):
+            regressions.append({'metric': key, 'baseline': before, 'current': after, 'ratio': after / before})
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark aplikasi passing grade")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=600, help="Batas waktu satu rerun AppTest (detik)")
+    parser.add_argument('--train-max-rows', type=int, default=50_000,
+                        help="Sampel baris maksimum untuk benchmark pelatihan")
+    parser.add_argument('--skip', nargs='*', default=[], choices=['pages', 'prediction', 'recommendation', 'training'])
+    parser.add_argument('--out', help="Simpan hasil ke file JSON")
+    parser.add_argument('--baseline', help="File JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument('--threshold', type=float, default=0.25)
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.repeat, args.timeout, args.train_max_rows, set(args.skip))
+    if args.baseline:
+        with open(args.baseline) as f:
+            report['regressions'] = compare(report, json.load(f), args.threshold)
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    for regression in report.get('regressions', []):
+        print(f"REGRESI {regression['metric']}: {regression['baseline']:.2f} -> {regression['current']:.2f} "
+              f"(x{regression['ratio']:.2f})", file=sys.stderr)
+    sys.exit(1 if report.get('regressions') else 0)
@@ -0,0 +1,114 @@
+import numpy as np
+
+# Tahap data grafik untuk halaman "Tampilkan Grafik". Setiap grafik hanya
+# menerima kolom yang di-encode, seri garis diturunkan ke anggaran titik tetap
+# (LTTB), dan spesifikasi Vega-Lite dibangun sekali per versi dataset lalu
+# di-cache lewat loader.load_chart_specs, sehingga ukuran payload tetap datar
+# meskipun dataset bertambah besar.
+
+POINT_BUDGET = 1000
+# Kolom yang perlu dibaca dari store untuk semua grafik
+CHART_COLUMNS = ['index', 'NAMA PRODI', 'PTN', 'RATAAN', 'MIN', 'MAX']
+
+
+def lttb(x, y, budget=POINT_BUDGET):
+    # Largest-Triangle-Three-Buckets: mengembalikan indeks titik terpilih
+    # (x harus sudah terurut) yang paling mempertahankan bentuk garis
+    n = len(x)
+    if budget >= n or budget < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, budget - 1).astype(int)
+    selected = np.empty(budget, dtype=np.int64)
+    selected[0] = 0
+    a = 0
+    for i in range(budget - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    selected[-1] = n - 1
+    return selected
+
+
+def build_chart_data(df, point_budget=POINT_BUDGET):
+    data = {}
+
+    rataan = df[['index', 'RATAAN']].dropna()
+    data['rataan'] = rataan.iloc[lttb(rataan['index'], rataan['RATAAN'], point_budget)]
+
+    # Garis MIN dan MAX memakai satu dataset bersama; titik yang dipertahankan
+    # adalah gabungan pilihan LTTB kedua seri
+    relation = df[['RATAAN', 'MIN', 'MAX']].dropna().sort_values('RATAAN', kind='stable')
+    keep = np.union1d(
+        lttb(relation['RATAAN'], relation['MIN'], point_budget),
+        lttb(relation['RATAAN'], relation['MAX'], point_budget),
+    )
+    data['relation'] = relation.iloc[keep]
+
+    programs = df[['NAMA PRODI', 'PTN', 'MIN']]
+    for key, rows in (('top10', programs.nlargest(10, 'MIN')), ('bottom10', programs.nsmallest(10, 'MIN'))):
+        rows = rows.copy()
+        rows['PRODI_PTN'] = rows['NAMA PRODI'].astype(str) + " - " + rows['PTN'].astype(str)
+        data[key] = rows
+    return data
+
+
+def _programs_chart(alt, rows, title):
+    return alt.Chart(rows).mark_bar().encode(
+        x=alt.X('PRODI_PTN:N', title='Nama Prodi - PTN', sort='-y'),
+        y=alt.Y('MIN:Q', title='Nilai Passing Grade (MIN)'),
+        color=alt.Color('PTN:N', title='PTN', legend=alt.Legend(orient='bottom')),
+        tooltip=['NAMA PRODI', 'PTN', alt.Tooltip('MIN:Q', title='Passing Grade (MIN)', format='.2f')]
+    ).properties(
+        title=title,
+        width='container',
+        height=500
+    ).configure_axisX(
+        labelAngle=-45
+    ).configure_title(
+        fontSize=16,
+        anchor='start'
+    )
+
+
+def build_chart_specs(df, point_budget=POINT_BUDGET):
+    # Spesifikasi Vega-Lite (dict) siap untuk st.vega_lite_chart; altair hanya
+    # dibutuhkan saat spesifikasi dibangun ulang
+    import altair as alt
+
+    data = build_chart_data(df, point_budget)
+    specs = {}
+
+    specs['rataan'] = alt.Chart(data['rataan']).mark_line().encode(
+        x=alt.X('index:Q', title='Index'),
+        y=alt.Y('RATAAN:Q', title='Nilai RATAAN'),
+        tooltip=['index', 'RATAAN']
+    ).properties(title='Perubahan Nilai RATAAN').to_dict()
+
+    line_chart = alt.Chart().mark_line().encode(
+        x=alt.X('RATAAN:Q', title='Nilai RATAAN'),
+        y=alt.Y('MIN:Q', title='Nilai MIN'),
+        tooltip=['RATAAN', 'MIN']
+    )
+    line_chart_max = alt.Chart().mark_line(color='red').encode(
+        x=alt.X('RATAAN:Q', title='Nilai RATAAN'),
+        y=alt.Y('MAX:Q', title='Nilai MAX'),
+        tooltip=['RATAAN', 'MAX']
+    )
+    specs['relation'] = alt.layer(line_chart, line_chart_max, data=data['relation']).properties(
+        title='Hubungan antara RATAAN dan Nilai MIN'
+    ).to_dict()
+
+    specs['top10'] = None
+    specs['bottom10'] = None
+    if not df.empty:
+        specs['top10'] = _programs_chart(
+            alt, data['top10'], 'Sebaran 10 Prodi dengan Nilai Passing Grade Tertinggi').to_dict()
+        specs['bottom10'] = _programs_chart(
+            alt, data['bottom10'], 'Sebaran 10 Prodi dengan Nilai Passing Grade Terendah').to_dict()
+    return specs
@@ -0,0 +1,242 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# Artefak inferensi tanpa scikit-learn. Pasangan PolynomialFeatures + model
+# dikompilasi menjadi koefisien (model linear, file .json) atau tabel node
+# datar berbasis array (model pohon, file .npz), lengkap dengan versi skema
+# dan checksum. Evaluatornya cukup NumPy, tanpa pickle.
+
+SCHEMA_VERSION = 1
+LINEAR_FORMAT = 'passing-grade-linear'
+TREES_FORMAT = 'passing-grade-trees'
+INPUT_FEATURES = ['RATAAN', 'S.BAKU']
+
+
+def _checksum(payload):
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _poly_terms(features, powers):
+    # Setara dengan poly.transform: setiap kolom adalah hasil kali pangkat input.
+    # Pangkat tiap kolom input dibangun dengan perkalian berulang dan dipakai
+    # ulang antar-suku, tanpa array perantara (n, suku, input) dan tanpa `**`.
+    features = np.asarray(features, dtype=float).reshape(-1, powers.shape[1])
+    columns = [[np.ones(len(features)), features[:, i]] for i in range(features.shape[1])]
+    terms = np.empty((len(features), len(powers)))
+    for j, row in enumerate(powers):
+        term = None
+        for i, p in enumerate(row):
+            if p == 0:
+                continue
+            while len(columns[i]) <= p:
+                columns[i].append(columns[i][-1] * features[:, i])
+            term = columns[i][p] if term is None else term * columns[i][p]
+        terms[:, j] = 1.0 if term is None else term
+    return terms
+
+
+class CompiledLinear:
+    def __init__(self, powers, coef, intercept, model_name=''):
+        self.powers = np.asarray(powers, dtype=np.int64).reshape(-1, len(INPUT_FEATURES))
+        self.coef = np.asarray(coef, dtype=float)
+        self.intercept = float(intercept)
+        self.model_name = model_name
+        # Jalur skalar memakai float Python biasa, tanpa overhead alokasi array
+        self._terms = [
+            (float(c), int(p[0]), int(p[1]))
+            for c, p in zip(self.coef, self.powers) if c != 0.0
+        ]
+
+    def predict(self, features):
+        return _poly_terms(features, self.powers) @ self.coef + self.intercept
+
+    def predict_one(self, rataan, sbaku):
+        total = self.intercept
+        for c, p, q in self._terms:
+            total += c * rataan ** p * sbaku ** q
+        return total
+
+    def to_payload(self):
+        return {
+            'format': LINEAR_FORMAT,
+            'schema_version': SCHEMA_VERSION,
+            'model': self.model_name,
+            'input_features': INPUT_FEATURES,
+            'powers': self.powers.tolist(),
+            'coef': self.coef.tolist(),
+            'intercept': self.intercept,
+        }
+
+    def save(self, path):
+        payload = self.to_payload()
+        payload['checksum'] = _checksum(payload)
+        with open(path, 'w') as f:
+            json.dump(payload, f, indent=2)
+
+    @classmethod
+    def from_payload(cls, payload):
+        checksum = payload.pop('checksum', None)
+        if checksum != _checksum(payload):
+            raise ValueError("Checksum artefak model tidak cocok")
+        if payload.get('schema_version') != SCHEMA_VERSION:
+            raise ValueError(f"Versi skema artefak tidak didukung: {payload.get('schema_version')}")
+        return cls(payload['powers'], payload['coef'], payload['intercept'], payload.get('model', ''))
+
+
+class CompiledTrees:
+    # Semua pohon digabung menjadi satu tabel node; `roots` menunjuk akar tiap
+    # pohon. Prediksi = offset + scale * jumlah nilai daun seluruh pohon.
+
+    ARRAYS = ('roots', 'left', 'right', 'feature', 'threshold', 'value')
+
+    def __init__(self, powers, roots, left, right, feature, threshold, value,
+                 offset=0.0, scale=1.0, model_name=''):
+        self.powers = np.asarray(powers, dtype=np.int64).reshape(-1, len(INPUT_FEATURES))
+        self.roots = np.asarray(roots, dtype=np.int64)
+        self.left = np.asarray(left, dtype=np.int64)
+        self.right = np.asarray(right, dtype=np.int64)
+        self.feature = np.asarray(feature, dtype=np.int64)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.offset = float(offset)
+        self.scale = float(scale)
+        self.model_name = model_name
+
+    def predict(self, features):
+        # scikit-learn membandingkan fitur dalam float32, jadi begitu juga di sini
+        X = _poly_terms(features, self.powers).astype(np.float32).astype(np.float64)
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        while True:
+            internal = self.left[node] != -1
+            if not internal.any():
+                break
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(internal, np.where(go_left, self.left[node], self.right[node]), node)
+        return self.offset + self.scale * self.value[node].sum(axis=1)
+
+    def predict_one(self, rataan, sbaku):
+        return float(self.predict([[rataan, sbaku]])[0])
+
+    def _meta(self):
+        return {
+            'format': TREES_FORMAT,
+            'schema_version': SCHEMA_VERSION,
+            'model': self.model_name,
+            'input_features': INPUT_FEATURES,
+            'powers': self.powers.tolist(),
+            'offset': self.offset,
+            'scale': self.scale,
+        }
+
+    def _digest(self, meta):
+        h = hashlib.sha256(_checksum(meta).encode('ascii'))
+        for name in self.ARRAYS:
+            h.update(np.ascontiguousarray(getattr(self, name)).tobytes())
+        return h.hexdigest()
+
+    def save(self, path):
+        meta = self._meta()
+        meta['checksum'] = self._digest(self._meta())
+        # Ditulis lewat file handle agar np.savez tidak menambah akhiran .npz
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, meta=np.array(json.dumps(meta)),
+                                **{name: getattr(self, name) for name in self.ARRAYS})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            arrays = {name: data[name] for name in cls.ARRAYS}
+        if meta.get('schema_version') != SCHEMA_VERSION:
+            raise ValueError(f"Versi skema artefak tidak didukung: {meta.get('schema_version')}")
+        checksum = meta.pop('checksum', None)
+        compiled = cls(meta['powers'], offset=meta['offset'], scale=meta['scale'],
+                       model_name=meta.get('model', ''), **arrays)
+        if checksum != compiled._digest(compiled._meta()):
+            raise ValueError("Checksum artefak model tidak cocok")
+        return compiled
+
+
+def _flatten_trees(trees):
+    roots, left, right, feature, threshold, value = [], [], [], [], [], []
+    start = 0
+    for tree in trees:
+        t = tree.tree_
+        is_leaf = t.children_left == -1
+        roots.append(start)
+        left.append(np.where(is_leaf, -1, t.children_left + start))
+        right.append(np.where(is_leaf, -1, t.children_right + start))
+        feature.append(np.where(is_leaf, 0, t.feature))
+        threshold.append(t.threshold)
+        value.append(t.value.reshape(t.node_count, -1)[:, 0])
+        start += t.node_count
+    return [np.asarray(roots)] + [np.concatenate(a) for a in (left, right, feature, threshold, value)]
+
+
+def compile_model(poly, model):
+    # Mengubah poly + model hasil pelatihan menjadi evaluator NumPy murni
+    powers = np.asarray(poly.powers_)
+    name = type(model).__name__
+    if hasattr(model, 'coef_') and hasattr(model, 'intercept_'):
+        return CompiledLinear(powers, np.ravel(model.coef_), float(np.ravel(model.intercept_)[0]), name)
+    if hasattr(model, 'tree_'):
+        return CompiledTrees(powers, *_flatten_trees([model]), model_name=name)
+    if name == 'RandomForestRegressor' or name == 'ExtraTreesRegressor':
+        trees = model.estimators_
+        return CompiledTrees(powers, *_flatten_trees(trees), scale=1.0 / len(trees), model_name=name)
+    if name == 'GradientBoostingRegressor':
+        init = model.init_
+        offset = 0.0 if isinstance(init, str) else float(np.ravel(init.constant_)[0])
+        return CompiledTrees(powers, *_flatten_trees(model.estimators_[:, 0]), offset=offset,
+                             scale=model.learning_rate, model_name=name)
+    raise ValueError(f"Model {name} belum bisa dikompilasi")
+
+
+def artifact_path_for(model_path, compiled):
+    extension = '.json' if isinstance(compiled, CompiledLinear) else '.npz'
+    return os.path.splitext(model_path)[0] + extension
+
+
+def load_artifact(path):
+    if path.endswith('.npz'):
+        return CompiledTrees.load(path)
+    with open(path) as f:
+        payload = json.load(f)
+    if payload.get('format') != LINEAR_FORMAT:
+        raise ValueError(f"Format artefak tidak dikenal: {payload.get('format')}")
+    return CompiledLinear.from_payload(payload)
+
+
+if __name__ == '__main__':
+    import argparse
+    import pickle
+
+    parser = argparse.ArgumentParser(description="Kompilasi model .sav menjadi artefak inferensi tanpa pickle")
+    parser.add_argument('--model', default='Lasso_Regression.sav')
+    parser.add_argument('--poly', default='polynomial_features.sav')
+    parser.add_argument('--out', help="Default: nama file model dengan akhiran .json/.npz")
+    parser.add_argument('--tolerance', type=float, default=1e-6)
+    args = parser.parse_args()
+
+    with open(args.model, 'rb') as f:
+        model = pickle.load(f)
+    with open(args.poly, 'rb') as f:
+        poly = pickle.load(f)
+
+    compiled = compile_model(poly, model)
+    out = args.out or artifact_path_for(args.model, compiled)
+    compiled.save(out)
+
+    # Verifikasi di seluruh rentang input yang diterima aplikasi
+    rataan, sbaku = np.meshgrid(np.arange(0, 801), np.arange(0, 31), indexing='ij')
+    grid = np.column_stack([rataan.ravel(), sbaku.ravel()]).astype(float)
+    expected = model.predict(poly.transform(grid))
+    error = np.max(np.abs(load_artifact(out).predict(grid) - expected))
+    print(f"Artefak ditulis ke {out}; selisih maksimum terhadap model asli: {error:.3g}")
+    if error > args.tolerance * max(1.0, np.max(np.abs(expected))):
+        raise SystemExit("Artefak tidak cocok dengan model asli")
@@ -0,0 +1,128 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import tracing
+from loader import load_compiled, load_lookup, load_model, load_poly
+
+# Logika prediksi dan rekomendasi yang dipakai bersama oleh aplikasi Streamlit,
+# prediksi massal (batch.py), dan layanan HTTP (server.py).
+
+MAX_RATAAN = 800
+MAX_SBAKU = 30
+
+METHOD_MIN = 'min'
+METHOD_PROFILE = 'profile'
+
+
+class Predictor:
+    # Membungkus pasangan PolynomialFeatures + model regresi. Input berbentuk
+    # (n, 2) berisi kolom RATAAN dan S.BAKU; satu panggilan predict per batch.
+
+    def __init__(self, model, poly):
+        self.model = model
+        self.poly = poly
+
+    def predict(self, features):
+        features = np.asarray(features, dtype=float).reshape(-1, 2)
+        if len(features) == 0:
+            return np.empty(0)
+        with tracing.span('poly_transform'):
+            transformed = self.poly.transform(features)
+        with tracing.span('model_predict'):
+            return np.asarray(self.model.predict(transformed), dtype=float)
+
+    def predict_one(self, rataan, sbaku):
+        return float(self.predict([[rataan, sbaku]])[0])
+
+
+def load_predictor(model_path='Lasso_Regression.sav', poly_path='polynomial_features.sav', artifact_path=None):
+    # Artefak terkompilasi (compiled.py) dipakai bila tersedia; evaluatornya punya
+    # antarmuka predict/predict_one yang sama dengan Predictor
+    if artifact_path and os.path.exists(artifact_path):
+        return load_compiled(artifact_path)
+    return Predictor(load_model(model_path), load_poly(poly_path))
+
+
+class ReloadingPredictor:
+    # Menyelesaikan model lewat cache loader di setiap panggilan, sehingga artefak
+    # yang diganti atomik (mis. oleh incremental.py) langsung dipakai tanpa restart.
+    # Panggilan yang sedang berjalan tetap memakai objek model lama. Dengan
+    # `data_path`, tabel grid (lookup.py) dipakai selama dataset tersedia.
+
+    def __init__(self, model_path='Lasso_Regression.sav', poly_path='polynomial_features.sav', artifact_path=None,
+                 data_path=None):
+        self.model_path = model_path
+        self.poly_path = poly_path
+        self.artifact_path = artifact_path
+        self.data_path = data_path
+        self.current()
+
+    def lookup(self):
+        if self.data_path is None:
+            return None
+        try:
+            return load_lookup(self.data_path, self.artifact_path, self.model_path, self.poly_path)
+        except FileNotFoundError:
+            return None
+
+    def current(self):
+        lookup = self.lookup()
+        if lookup is not None:
+            return lookup
+        return load_predictor(self.model_path, self.poly_path, self.artifact_path)
+
+    def predict(self, features):
+        return self.current().predict(features)
+
+    def predict_one(self, rataan, sbaku):
+        return self.current().predict_one(rataan, sbaku)
+
+
+def validate_scores(rataan, sbaku):
+    # Validasi tervektorisasi: mengembalikan nilai numerik dan alasan penolakan
+    # per baris (string kosong berarti baris valid)
+    rataan = pd.to_numeric(pd.Series(rataan), errors='coerce').to_numpy(dtype=float)
+    sbaku = pd.to_numeric(pd.Series(sbaku), errors='coerce').to_numpy(dtype=float)
+    reasons = np.select(
+        [
+            np.isnan(rataan),
+            np.isnan(sbaku),
+            (rataan <= 0) | (rataan > MAX_RATAAN),
+            (sbaku <= 0) | (sbaku > MAX_SBAKU),
+        ],
+        [
+            "RATAAN kosong atau bukan angka",
+            "S.BAKU kosong atau bukan angka",
+            f"RATAAN harus di antara 0 dan {MAX_RATAAN}",
+            f"S.BAKU harus di antara 0 dan {MAX_SBAKU}",
+        ],
+        default="",
+    )
+    return rataan, sbaku, reasons
+
+
+def recommend(recommender, predicted_min, k=5, ptn=None, prodi=None,
+              method=METHOD_MIN, rataan=None, sbaku=None, lookup=None):
+    # Mencari rekomendasi dengan filter PTN/prodi; bila tidak ada yang cocok,
+    # filter dilonggarkan bertahap. Mengembalikan (hasil, catatan atau None).
+    # Pencarian MIN tanpa filter diambil dari `lookup` (lookup.py) bila tersedia.
+    def search(ptn=None, prodi=None):
+        if method == METHOD_PROFILE:
+            return recommender.nearest_profile(rataan, sbaku, predicted_min, k=k, ptn=ptn, prodi=prodi)
+        if lookup is not None and not (ptn and ptn.strip()) and not (prodi and prodi.strip()):
+            result = lookup.nearest_min(rataan, sbaku, predicted_min, k=k)
+            if result is not None:
+                return result
+        return recommender.nearest_min(predicted_min, k=k, ptn=ptn, prodi=prodi)
+
+    with tracing.span('recommend', method=method):
+        result = search(ptn, prodi)
+        if not result.empty or not (ptn or prodi):
+            return result, None
+        if ptn and prodi:
+            result = search(ptn)
+            if not result.empty:
+                return result, "Prodi tidak ditemukan di PTN tersebut, menampilkan rekomendasi dari PTN yang sama."
+        return search(), "PTN dan Prodi tidak ditemukan di dataset, menampilkan rekomendasi dari semua PTN."
@@ -0,0 +1,243 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:
+    # Tanpa flock (Windows) versi lama tidak pernah dihapus otomatis
+    fcntl = None
+
+# Penyimpanan dataset kolumnar di disk. CSV dikonversi sekali menjadi satu file
+# .npy per kolom: nama PTN/prodi disimpan sebagai kode kamus (categorical),
+# kolom bilangan bulat di-downcast, dan kolom float disimpan float64 apa adanya.
+# Kolom dibuka dengan memory-map hanya saat dibutuhkan dan dikembalikan sebagai
+# view, sehingga beberapa worker di mesin yang sama berbagi page cache yang sama
+# tanpa menyalin data, dan paging tidak perlu memuat seluruh tabel.
+# Setiap build ditulis sebagai versi baru (passing-grade.store/v-*/) dan file
+# CURRENT menunjuk versi yang berlaku.
+#
+#   python dataset_store.py passing-grade.csv     # bangun ulang store
+
+STORE_VERSION = 3
+CURRENT_FILE = 'CURRENT'
+LOCK_FILE = '.lock'
+CATEGORICAL_COLUMNS = ['PTN', 'NAMA PRODI']
+# Baris tanpa RATAAN/S.BAKU dibuang, seperti tampilan dataset sebelumnya
+REQUIRED_COLUMNS = ['RATAAN', 'S.BAKU']
+
+
+def default_store_dir(csv_path):
+    return os.path.splitext(csv_path)[0] + '.store'
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _codes_dtype(n_categories):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _downcast(series):
+    # Bilangan bulat ke tipe terkecil; float tetap float64 agar kolom bisa
+    # dikembalikan langsung sebagai view memory-map tanpa konversi per worker
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast='integer').to_numpy()
+    return series.to_numpy(dtype=np.float64)
+
+
+def build_store(csv_path, store_dir=None):
+    # Konversi CSV ke versi baru di dalam direktori store. Setiap build menulis
+    # direktori versinya sendiri lalu penunjuk CURRENT diganti atomik, sehingga
+    # beberapa proses yang membangun bersamaan tidak saling menimpa dan pembaca
+    # tidak pernah melihat store setengah jadi. Mengembalikan path versi baru.
+    store_dir = store_dir or default_store_dir(csv_path)
+    os.makedirs(store_dir, exist_ok=True)
+    df = pd.read_csv(csv_path, dtype={column: 'category' for column in CATEGORICAL_COLUMNS})
+    df = df.reset_index().dropna(subset=REQUIRED_COLUMNS)
+
+    tmp_dir = tempfile.mkdtemp(prefix='build-', dir=store_dir)
+    columns = {}
+    for i, name in enumerate(df.columns):
+        file_name = f'{i:02d}.npy'
+        series = df[name]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = [str(c) for c in series.cat.categories]
+            codes = series.cat.codes.to_numpy().astype(_codes_dtype(len(categories)))
+            np.save(os.path.join(tmp_dir, file_name), codes)
+            columns[name] = {'kind': 'category', 'file': file_name, 'categories': categories}
+        else:
+            values = _downcast(series)
+            np.save(os.path.join(tmp_dir, file_name), values)
+            columns[name] = {'kind': 'numeric', 'file': file_name, 'dtype': str(values.dtype)}
+
+    stat = os.stat(csv_path)
+    meta = {
+        'version': STORE_VERSION,
+        'rows': len(df),
+        'columns': columns,
+        'source': {
+            'sha256': _file_digest(csv_path),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+        },
+    }
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+    open(os.path.join(tmp_dir, LOCK_FILE), 'w').close()
+
+    version = f"v-{time.time_ns()}-{os.getpid()}"
+    os.rename(tmp_dir, os.path.join(store_dir, version))
+    pointer_tmp = os.path.join(store_dir, f'{CURRENT_FILE}.{version}.tmp')
+    with open(pointer_tmp, 'w') as f:
+        f.write(version)
+    os.replace(pointer_tmp, os.path.join(store_dir, CURRENT_FILE))
+    remove_unused_versions(store_dir)
+    return os.path.join(store_dir, version)
+
+
+def _current_version(store_dir):
+    try:
+        with open(os.path.join(store_dir, CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def remove_unused_versions(store_dir):
+    # Versi lama dihapus hanya bila tidak ada pembaca yang memegang kunci
+    # bersama (shared lock) pada versi tersebut; yang masih dipakai dilewati
+    # dan dicoba lagi pada build berikutnya.
+    if fcntl is None:
+        return
+    current = _current_version(store_dir)
+    for name in os.listdir(store_dir):
+        if not name.startswith('v-') or name == current:
+            continue
+        path = os.path.join(store_dir, name)
+        try:
+            lock = open(os.path.join(path, LOCK_FILE))
+        except FileNotFoundError:
+            continue
+        with lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _is_fresh(version_dir, csv_path):
+    try:
+        with open(os.path.join(version_dir, 'meta.json')) as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return False
+    if meta.get('version') != STORE_VERSION:
+        return False
+    source = meta['source']
+    stat = os.stat(csv_path)
+    if (stat.st_mtime_ns, stat.st_size) == (source['mtime_ns'], source['size']):
+        return True
+    return stat.st_size == source['size'] and _file_digest(csv_path) == source['sha256']
+
+
+def open_store(csv_path, store_dir=None):
+    # Membuka versi store terkini untuk `csv_path`, membangunnya ulang bila
+    # belum ada atau CSV berubah
+    store_dir = store_dir or default_store_dir(csv_path)
+    while True:
+        version = _current_version(store_dir)
+        version_dir = os.path.join(store_dir, version) if version else None
+        if version_dir is None or not _is_fresh(version_dir, csv_path):
+            version_dir = build_store(csv_path, store_dir)
+        try:
+            return DatasetStore(version_dir)
+        except FileNotFoundError:
+            # Versi dihapus di antara membaca CURRENT dan mengunci; baca ulang penunjuknya
+            continue
+
+
+class DatasetStore:
+    # Satu versi store. Selama objek ini hidup, kunci bersama pada versinya
+    # mencegah remove_unused_versions menghapus file kolom yang dipetakan
+    # secara lazy.
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        self._lock_file = open(os.path.join(store_dir, LOCK_FILE))
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file, fcntl.LOCK_SH)
+            # Penghapus mungkin selesai tepat sebelum kunci didapat
+            with open(os.path.join(store_dir, 'meta.json')) as f:
+                self.meta = json.load(f)
+        except BaseException:
+            self._lock_file.close()
+            raise
+        self.columns = list(self.meta['columns'])
+        self._arrays = {}
+        self._dtypes = {}
+
+    def __len__(self):
+        return self.meta['rows']
+
+    def _array(self, name):
+        array = self._arrays.get(name)
+        if array is None:
+            info = self.meta['columns'][name]
+            array = np.load(os.path.join(self.store_dir, info['file']), mmap_mode='r')
+            self._arrays[name] = array
+        return array
+
+    def _category_dtype(self, name):
+        dtype = self._dtypes.get(name)
+        if dtype is None:
+            dtype = self._dtypes[name] = pd.CategoricalDtype(self.meta['columns'][name]['categories'])
+        return dtype
+
+    def column(self, name, start=0, stop=None):
+        values = self._array(name)[start:stop]
+        info = self.meta['columns'][name]
+        if info['kind'] == 'category':
+            return pd.Categorical.from_codes(values, dtype=self._category_dtype(name))
+        # Kolom numerik dikembalikan sebagai view memory-map (tanpa salinan)
+        return values
+
+    def frame(self, columns=None, start=0, stop=None):
+        # Hanya kolom dan rentang baris yang diminta yang dibaca dari disk; kolom
+        # numerik tetap berupa view memory-map (copy=False)
+        columns = columns or self.columns
+        stop = len(self) if stop is None else min(stop, len(self))
+        start = min(start, stop)
+        return pd.DataFrame(
+            {name: self.column(name, start, stop) for name in columns},
+            index=pd.RangeIndex(start, stop),
+            copy=False,
+        )
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bangun store kolumnar dari CSV passing grade")
+    parser.add_argument('csv', nargs='?', default='passing-grade.csv')
+    parser.add_argument('--store')
+    args = parser.parse_args()
+    store = DatasetStore(build_store(args.csv, args.store))
+    size = sum(os.path.getsize(os.path.join(store.store_dir, f)) for f in os.listdir(store.store_dir))
+    print(f"{len(store):,} baris, {len(store.columns)} kolom, {size / 2**20:.2f} MB di {store.store_dir}")
@@ -0,0 +1,109 @@
+import argparse
+import json
+import re
+import subprocess
+import sys
+
+# Profil waktu import per halaman menu dan per mode serving, memakai
+# `python -X importtime` di proses baru agar cache import tidak memengaruhi hasil.
+#
+#   python importprof.py                       # tabel ringkas
+#   python importprof.py --json importprof.json
+#   python importprof.py --baseline importprof.json --threshold 0.2
+
+# Modul yang di-import setiap halaman di passing_grade.py (ikuti bila halaman berubah)
+TARGETS = {
+    'Home': ['streamlit'],
+    'Lihat Dataset': ['streamlit', 'loader', 'dataset_store'],
+    'Tampilkan Grafik': ['streamlit', 'loader', 'dataset_store', 'chart_data', 'altair'],
+    'Prediksi Passing Grade': ['streamlit', 'core', 'loader', 'dataset_store', 'recommender', 'compiled', 'lookup'],
+    'Prediksi Massal': ['streamlit', 'batch', 'loader', 'dataset_store', 'recommender', 'compiled', 'lookup'],
+    'Modelling': ['streamlit', 'training', 'incremental', 'sklearn.preprocessing', 'sklearn.linear_model', 'sklearn.ensemble'],
+    'server': ['server', 'recommender', 'compiled', 'lookup'],
+}
+
+# Modul yang tidak boleh ikut termuat pada target tertentu
+FORBIDDEN = {
+    'server': ['training', 'sklearn', 'streamlit', 'altair'],
+    'Home': ['pandas', 'altair', 'sklearn'],
+}
+
+_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def profile(modules):
+    # Mengembalikan {modul: (self_us, cumulative_us, kedalaman)} untuk satu proses baru
+    code = '; '.join(f'import {module}' for module in modules)
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    timings = {}
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            timings[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return timings
+
+
+def report(targets, top=10):
+    results = {}
+    for target, modules in targets.items():
+        timings = profile(modules)
+        roots = {name: cumulative for name, (_, cumulative, depth) in timings.items() if depth == 0}
+        heaviest = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)[:top]
+        loaded_forbidden = sorted({
+            name for name in timings for forbidden in FORBIDDEN.get(target, [])
+            if name == forbidden or name.startswith(forbidden + '.')
+        })
+        results[target] = {
+            'total_ms': sum(roots.values()) / 1000,
+            'modules': len(timings),
+            'top': [{'module': name, 'cumulative_ms': cumulative / 1000, 'self_ms': self_us / 1000}
+                    for name, (self_us, cumulative, _) in heaviest],
+            'forbidden_loaded': loaded_forbidden,
+        }
+    return results
+
+
+def compare(results, baseline, threshold):
+    # Target yang waktu import-nya naik lebih dari `threshold` (mis. 0.2 = 20%)
+    regressions = []
+    for target, result in results.items():
+        previous = baseline.get(target)
+        if previous and result['total_ms'] > previous['total_ms'] * (1 + threshold):
+            regressions.append((target, previous['total_ms'], result['total_ms']))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Profil waktu import per halaman aplikasi")
+    parser.add_argument('--top', type=int, default=10, help="Jumlah modul terberat per target")
+    parser.add_argument('--json', help="Simpan hasil ke file JSON")
+    parser.add_argument('--baseline', help="File JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = report(TARGETS, args.top)
+    for target, result in results.items():
+        print(f"\n== {target}: {result['total_ms']:.1f} ms, {result['modules']} modul")
+        for item in result['top']:
+            print(f"   {item['cumulative_ms']:9.1f} ms  {item['module']}")
+        if result['forbidden_loaded']:
+            print(f"   !! modul terlarang ikut termuat: {', '.join(result['forbidden_loaded'])}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    failed = any(result['forbidden_loaded'] for result in results.values())
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for target, before, after in regressions:
+            print(f"Regresi import {target}: {before:.1f} ms -> {after:.1f} ms")
+        failed = failed or bool(regressions)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,400 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+import tracing
+from compiled import CompiledLinear, _checksum, _poly_terms, load_artifact
+
+try:
+    import fcntl
+except ImportError:
+    # Tanpa flock (Windows) pembaruan hanya diserialkan di dalam satu proses
+    fcntl = None
+
+# Pembaruan inkremental untuk model linear (Linear/Ridge/Lasso) saat baris
+# passing grade baru datang. Yang disimpan hanya statistik cukup dari fitur
+# polinomial dan MIN: jumlah baris, rata-rata, dan matriks ko-momen terpusat
+# (digabung dengan rumus Chan, stabil secara numerik). Koefisien dihitung ulang
+# dari statistik tersebut, sehingga biaya satu pembaruan sebanding dengan
+# ukuran batch, bukan seluruh riwayat:
+#
+#   LinearRegression  G w = c               (lstsq)
+#   Ridge             (G + alpha I) w = c
+#   Lasso             coordinate descent pada G, c (warm start dari w lama)
+#
+# dengan G = X_cᵀX_c dan c = X_cᵀy_c (terpusat), seperti fit_intercept=True.
+# Baris baru hanya berisi RATAAN/S.BAKU/MIN, jadi tidak ditulis ke CSV dataset
+# (yang juga dipakai rekomendasi, grafik, dan tampilan dataset); baris disimpan
+# di file tersendiri di samping artefak (`*.rows.csv`). Dengan begitu CSV dataset
+# tidak berubah dan penyimpanan kolom, indeks rekomendasi, tabel lookup, serta
+# data grafik tidak perlu dibangun ulang pada setiap pembaruan.
+#
+# Setiap `refit_every` baris, atau bila MSE baris baru (dikumpulkan minimal
+# `drift_min_rows` baris) jauh di atas MSE latih (indikasi drift), statistik
+# dihitung ulang penuh dari CSV dataset ditambah file baris baru. Artefak JSON
+# (compiled.py) ditulis atomik lewat os.replace; loader.load_compiled memuat
+# versi baru pada permintaan berikutnya tanpa menghentikan prediksi.
+#
+#   python incremental.py baris_baru.csv        # tambah baris + perbarui model
+#   python incremental.py --refit               # refit penuh dari CSV + baris baru
+
+STATE_FORMAT = 'passing-grade-incremental'
+STATE_VERSION = 1
+# Nama kelas di artefak -> nama model di training.MODEL_NAMES
+INCREMENTAL_MODELS = {
+    'LinearRegression': "Linear Regression",
+    'Ridge': "Ridge Regression",
+    'Lasso': "Lasso Regression",
+}
+UPDATE_COLUMNS = ['RATAAN', 'S.BAKU', 'MIN']
+HISTORY_SIZE = 50
+
+
+def default_state_path(artifact_path):
+    return os.path.splitext(artifact_path)[0] + '.state.json'
+
+
+def default_rows_path(artifact_path):
+    return os.path.splitext(artifact_path)[0] + '.rows.csv'
+
+
+def default_lock_path(artifact_path):
+    return os.path.splitext(artifact_path)[0] + '.update.lock'
+
+
+class RunningStats:
+    # Rata-rata dan ko-momen terpusat dari z = [fitur polinomial..., MIN]
+
+    def __init__(self, n, mean, comoment):
+        self.n = int(n)
+        self.mean = np.asarray(mean, dtype=float)
+        self.comoment = np.asarray(comoment, dtype=float)
+
+    @classmethod
+    def from_arrays(cls, X, y):
+        Z = np.column_stack([X, y])
+        mean = Z.mean(axis=0) if len(Z) else np.zeros(Z.shape[1])
+        centered = Z - mean
+        return cls(len(Z), mean, centered.T @ centered)
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            return other
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        mean = self.mean + delta * (other.n / n)
+        comoment = self.comoment + other.comoment + np.outer(delta, delta) * (self.n * other.n / n)
+        return RunningStats(n, mean, comoment)
+
+    def gram(self):
+        # (G, c, yy): ko-momen fitur, fitur-target, dan target
+        return self.comoment[:-1, :-1], self.comoment[:-1, -1], self.comoment[-1, -1]
+
+    def mse(self, coef):
+        G, c, yy = self.gram()
+        return float((yy - 2 * coef @ c + coef @ G @ coef) / self.n) if self.n else 0.0
+
+    def to_payload(self):
+        return {'n': self.n, 'mean': self.mean.tolist(), 'comoment': self.comoment.tolist()}
+
+
+def _lasso_cd(G, c, penalty, coef, tol=1e-10, max_iter=100_000):
+    # Coordinate descent untuk (1/2) wᵀGw - cᵀw + penalty * |w|₁. Memakai float
+    # Python biasa karena jumlah fitur kecil (5 untuk polinomial derajat 2).
+    G = G.tolist()
+    c = c.tolist()
+    w = [float(v) for v in coef]
+    p = len(w)
+    for _ in range(max_iter):
+        max_step = max_coef = 0.0
+        for j in range(p):
+            if G[j][j] <= 0.0:
+                continue
+            row = G[j]
+            rho = c[j] - sum(row[k] * w[k] for k in range(p)) + row[j] * w[j]
+            new = (abs(rho) - penalty) / row[j] if abs(rho) > penalty else 0.0
+            new = new if rho >= 0 else -new
+            max_step = max(max_step, abs(new - w[j]))
+            max_coef = max(max_coef, abs(new))
+            w[j] = new
+        if max_step <= tol * max(max_coef, 1e-300):
+            break
+    return np.asarray(w)
+
+
+def solve(stats, model_name, alpha, coef=None):
+    # Koefisien dan intercept dari statistik cukup; `coef` dipakai sebagai warm start Lasso
+    G, c, _ = stats.gram()
+    p = len(c)
+    if model_name == 'Lasso':
+        coef = _lasso_cd(G, c, stats.n * alpha, coef if coef is not None else np.zeros(p))
+    elif model_name == 'Ridge':
+        coef = np.linalg.solve(G + alpha * np.eye(p), c)
+    else:
+        coef = np.linalg.lstsq(G, c, rcond=None)[0]
+    intercept = float(stats.mean[-1] - stats.mean[:-1] @ coef)
+    return coef, intercept
+
+
+def prepare_rows(rows):
+    # Baris dengan RATAAN/S.BAKU/MIN valid; mengembalikan (baris valid, jumlah baris ditolak)
+    from core import validate_scores
+
+    missing = [column for column in UPDATE_COLUMNS if column not in rows.columns]
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ada: {', '.join(missing)}")
+    rataan, sbaku, reasons = validate_scores(rows['RATAAN'], rows['S.BAKU'])
+    min_values = pd.to_numeric(rows['MIN'], errors='coerce').to_numpy(dtype=float)
+    valid = (reasons == "") & np.isfinite(min_values)
+    rows = rows[valid].copy()
+    rows['RATAAN'], rows['S.BAKU'], rows['MIN'] = rataan[valid], sbaku[valid], min_values[valid]
+    return rows, int((~valid).sum())
+
+
+def append_rows(rows_path, rows):
+    # Menambahkan kolom UPDATE_COLUMNS dari `rows` ke akhir file baris baru;
+    # header ditulis bila file belum ada
+    write_header = not os.path.exists(rows_path) or os.path.getsize(rows_path) == 0
+    with open(rows_path, 'a', newline='') as f:
+        rows[UPDATE_COLUMNS].to_csv(f, header=write_header, index=False)
+
+
+def read_rows(rows_path):
+    # Baris baru yang tersimpan, atau DataFrame kosong bila belum ada pembaruan
+    try:
+        return pd.read_csv(rows_path)
+    except (FileNotFoundError, pd.errors.EmptyDataError):
+        return pd.DataFrame(columns=UPDATE_COLUMNS, dtype=float)
+
+
+def _write_json_atomic(payload, path):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class IncrementalUpdater:
+    def __init__(self, csv_path='passing-grade.csv', artifact_path='Lasso_Regression.json',
+                 state_path=None, rows_path=None, refit_every=5000, drift_ratio=2.0, drift_min_rows=200):
+        self.csv_path = csv_path
+        self.artifact_path = artifact_path
+        self.state_path = state_path or default_state_path(artifact_path)
+        self.rows_path = rows_path or default_rows_path(artifact_path)
+        self.refit_every = refit_every
+        self.drift_ratio = drift_ratio
+        # Galat batch baru dikumpulkan lintas batch sampai minimal sebanyak ini
+        # sebelum dibandingkan dengan MSE latih, agar batch kecil yang berisik
+        # tidak memicu refit penuh
+        self.drift_min_rows = drift_min_rows
+        self.lock_path = default_lock_path(artifact_path)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _exclusive(self):
+        # Baca-tambah-hitung-terbitkan diserialkan antar thread dan antar proses
+        # (worker Streamlit lain atau CLI) lewat flock pada file lock di samping
+        # artefak, agar statistik satu batch tidak tertimpa pembaruan lain
+        with self._lock, open(self.lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def update(self, rows):
+        # Menyimpan baris baru ke file baris lalu memperbarui statistik dan artefak.
+        # Mengembalikan ringkasan pembaruan (termasuk hasil refit bila dijalankan).
+        with self._exclusive():
+            start = time.perf_counter()
+            rows, invalid = prepare_rows(rows)
+            state = self._load_state()
+            powers = np.asarray(state['powers'])
+            coef = np.asarray(state['coef'])
+
+            with tracing.span('incremental/update', rows=len(rows)):
+                X = _poly_terms(rows[['RATAAN', 'S.BAKU']].to_numpy(), powers)
+                y = rows['MIN'].to_numpy(dtype=float)
+                # Galat prediksi model lama pada batch baru (sebelum diperbarui) sebagai sinyal drift
+                batch_sse = float(np.sum((X @ coef + state['intercept'] - y) ** 2))
+                batch_mse = batch_sse / len(y) if len(y) else None
+                if len(rows):
+                    append_rows(self.rows_path, rows)
+                stats = RunningStats(**state['stats']).merge(RunningStats.from_arrays(X, y))
+                coef, intercept = solve(stats, state['model'], state['alpha'], coef)
+
+            result = {
+                'rows': len(rows),
+                'invalid': invalid,
+                'batch_mse': batch_mse,
+                'train_mse': stats.mse(coef),
+                'total_rows': stats.n,
+                'refit': None,
+            }
+            state['rows_since_refit'] += len(rows)
+            state['history'] = (state['history'] + [{
+                'ts': time.time(), 'rows': len(rows), 'batch_mse': batch_mse, 'train_mse': result['train_mse'],
+            }])[-HISTORY_SIZE:]
+
+            window = state.setdefault('drift_window', {'rows': 0, 'sse': 0.0})
+            window['rows'] += len(rows)
+            window['sse'] += batch_sse
+            drift = False
+            if window['rows'] >= self.drift_min_rows:
+                result['window_mse'] = window['sse'] / window['rows']
+                drift = result['window_mse'] > self.drift_ratio * max(result['train_mse'], 1e-12)
+                state['drift_window'] = {'rows': 0, 'sse': 0.0}
+            self._publish(state, stats, coef, intercept)
+
+            if drift or state['rows_since_refit'] >= self.refit_every:
+                result['refit'] = self._refit(state, 'drift' if drift else 'periodik')
+            result['seconds'] = time.perf_counter() - start
+            return result
+
+    def refit(self):
+        with self._exclusive():
+            return self._refit(self._load_state(), 'manual')
+
+    def status(self):
+        # None bila belum ada pembaruan untuk artefak ini (state dibuat pada pembaruan pertama)
+        with self._lock:
+            state = self._read_state()
+        if state is None:
+            return None
+        return {
+            'model': state['model'],
+            'alpha': state['alpha'],
+            'total_rows': state['stats']['n'],
+            'rows_since_refit': state['rows_since_refit'],
+            'last_refit': state['last_refit'],
+            'history': state['history'],
+        }
+
+    def _refit(self, state, reason):
+        # Refit penuh dari CSV dataset dan file baris baru; selisih prediksi
+        # terhadap model inkremental dicatat sebagai ukuran pergeseran (akumulasi
+        # galat pembulatan atau baris yang belum tercatat di statistik)
+        from loader import load_training_data
+
+        start = time.perf_counter()
+        with tracing.span('incremental/refit', reason=reason):
+            df = pd.concat([load_training_data(self.csv_path)[UPDATE_COLUMNS], read_rows(self.rows_path)],
+                           ignore_index=True)
+            powers = np.asarray(state['powers'])
+            X = _poly_terms(df[['RATAAN', 'S.BAKU']].to_numpy(), powers)
+            y = df['MIN'].to_numpy(dtype=float)
+            stats = RunningStats.from_arrays(X, y)
+            coef, intercept = solve(stats, state['model'], state['alpha'], np.asarray(state['coef']))
+            incremental = X @ np.asarray(state['coef']) + state['intercept']
+            shift = float(np.max(np.abs(X @ coef + intercept - incremental))) if len(y) else 0.0
+
+        state['rows_since_refit'] = 0
+        state['drift_window'] = {'rows': 0, 'sse': 0.0}
+        state['last_refit'] = {
+            'ts': time.time(),
+            'reason': reason,
+            'rows': stats.n,
+            'train_mse': stats.mse(coef),
+            'max_prediction_shift': shift,
+            'seconds': time.perf_counter() - start,
+        }
+        self._publish(state, stats, coef, intercept)
+        return state['last_refit']
+
+    def _publish(self, state, stats, coef, intercept):
+        # State ditulis dulu, lalu artefak yang dibaca layanan; keduanya diganti atomik
+        compiled = CompiledLinear(state['powers'], coef, intercept, state['model'])
+        artifact = compiled.to_payload()
+        artifact['checksum'] = _checksum(artifact)
+        state.update({
+            'stats': stats.to_payload(),
+            'coef': compiled.coef.tolist(),
+            'intercept': compiled.intercept,
+            'artifact_checksum': artifact['checksum'],
+        })
+        _write_json_atomic(state, self.state_path)
+        _write_json_atomic(artifact, self.artifact_path)
+
+    def _read_state(self):
+        # State hanya berlaku untuk artefak yang ditulisnya sendiri; bila artefak
+        # sudah diganti proses lain (mis. "Latih Model"), state dianggap usang
+        with open(self.artifact_path) as f:
+            artifact_checksum = json.load(f).get('checksum')
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if (state.get('format') == STATE_FORMAT and state.get('schema_version') == STATE_VERSION
+                and state.get('artifact_checksum') == artifact_checksum):
+            return state
+        return None
+
+    def _load_state(self):
+        return self._read_state() or self._bootstrap()
+
+    def _bootstrap(self):
+        from training import MODEL_ALPHAS
+
+        artifact = load_artifact(self.artifact_path)
+        if not isinstance(artifact, CompiledLinear) or artifact.model_name not in INCREMENTAL_MODELS:
+            raise ValueError(
+                f"Pembaruan inkremental hanya mendukung model linear, bukan '{artifact.model_name}'")
+        state = {
+            'format': STATE_FORMAT,
+            'schema_version': STATE_VERSION,
+            'model': artifact.model_name,
+            'alpha': MODEL_ALPHAS.get(INCREMENTAL_MODELS[artifact.model_name], 0.0),
+            'powers': artifact.powers.tolist(),
+            'coef': artifact.coef.tolist(),
+            'intercept': artifact.intercept,
+            'rows_since_refit': 0,
+            'drift_window': {'rows': 0, 'sse': 0.0},
+            'last_refit': None,
+            'history': [],
+        }
+        self._refit(state, 'awal')
+        return state
+
+
+_updaters = {}
+_updaters_lock = threading.Lock()
+
+
+def get_updater(csv_path='passing-grade.csv', artifact_path='Lasso_Regression.json'):
+    # Satu updater per pasangan file di proses ini, agar pembaruan dari beberapa sesi berurutan
+    key = (os.path.abspath(csv_path), os.path.abspath(artifact_path))
+    with _updaters_lock:
+        updater = _updaters.get(key)
+        if updater is None:
+            updater = _updaters[key] = IncrementalUpdater(csv_path, artifact_path)
+        return updater
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pembaruan inkremental model linear passing grade")
+    parser.add_argument('rows', nargs='?', help="CSV/Parquet berisi baris baru (minimal RATAAN, S.BAKU, MIN)")
+    parser.add_argument('--data', default='passing-grade.csv')
+    parser.add_argument('--artifact', default='Lasso_Regression.json')
+    parser.add_argument('--refit', action='store_true', help="Jalankan refit penuh dari CSV dan baris baru")
+    args = parser.parse_args()
+
+    updater = get_updater(args.data, args.artifact)
+    if args.rows:
+        new_rows = pd.read_parquet(args.rows) if args.rows.endswith('.parquet') else pd.read_csv(args.rows)
+        print(json.dumps(updater.update(new_rows), indent=2))
+    if args.refit:
+        print(json.dumps(updater.refit(), indent=2))
+    if not args.rows and not args.refit:
+        print(json.dumps(updater.status(), indent=2) if updater.status() else "Belum ada state pembaruan inkremental")
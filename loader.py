@@ -0,0 +1,219 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+
+import tracing
+
+# Cache bersama untuk satu proses: Streamlit menjalankan ulang passing_grade.py
+# di setiap interaksi, tetapi modul yang di-import tetap hidup di sys.modules,
+# sehingga dataset dan model cukup diparsing sekali lalu dipakai semua sesi.
+# Objek yang dikembalikan dipakai bersama, jangan diubah (mutasi) oleh pemanggil.
+
+_lock = threading.Lock()
+_entries = {}
+_key_locks = {}
+
+
+class _Entry:
+    def __init__(self):
+        self.value = None
+        self.signature = None
+        self.digest = None
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.last_load_seconds = 0.0
+        self.total_load_seconds = 0.0
+
+
+def _paths(path):
+    # Satu path, atau tuple path untuk nilai turunan dari beberapa file
+    return (path,) if isinstance(path, str) else tuple(path)
+
+
+def _signature(path):
+    signatures = []
+    for p in _paths(path):
+        stat = os.stat(p)
+        signatures.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signatures)
+
+
+def _file_digest(path):
+    digests = []
+    for p in _paths(path):
+        h = hashlib.sha256()
+        with open(p, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        digests.append(h.hexdigest())
+    return tuple(digests)
+
+
+def _get_entry(key):
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            entry = _entries[key] = _Entry()
+            _key_locks[key] = threading.Lock()
+        return entry, _key_locks[key]
+
+
+def cached_load(path, loader, name=None):
+    # Memuat `path` dengan `loader(path)` sekali per proses. File diperiksa
+    # lewat mtime/ukuran (murah); bila berubah, hash isinya dibandingkan dan
+    # hanya dimuat ulang jika isinya memang berbeda. `path` boleh berupa tuple
+    # beberapa file; nilainya dimuat ulang bila salah satu file berubah.
+    abspaths = tuple(os.path.abspath(p) for p in _paths(path))
+    key = (name or loader.__name__, abspaths[0] if isinstance(path, str) else abspaths)
+    entry, key_lock = _get_entry(key)
+    signature = _signature(path)
+
+    if entry.signature == signature:
+        entry.hits += 1
+        return entry.value
+
+    with key_lock:
+        # Sesi lain mungkin sudah memuat ulang selagi kita menunggu lock
+        if entry.signature == signature:
+            entry.hits += 1
+            return entry.value
+
+        digest = _file_digest(path)
+        if entry.digest == digest:
+            entry.signature = signature
+            entry.hits += 1
+            return entry.value
+
+        start = time.perf_counter()
+        value = loader(path)
+        elapsed = time.perf_counter() - start
+
+        entry.value = value
+        entry.digest = digest
+        entry.signature = signature
+        entry.misses += 1
+        entry.loads += 1
+        entry.last_load_seconds = elapsed
+        entry.total_load_seconds += elapsed
+        tracing.record(f'load/{key[0]}', elapsed)
+        return value
+
+
+def cache_stats():
+    # Ringkasan hit/miss dan waktu muat untuk setiap artefak yang di-cache
+    with _lock:
+        items = list(_entries.items())
+    stats = []
+    for (name, path), entry in items:
+        stats.append({
+            'name': name,
+            'path': path if isinstance(path, str) else ', '.join(path),
+            'hits': entry.hits,
+            'misses': entry.misses,
+            'loads': entry.loads,
+            'last_load_seconds': entry.last_load_seconds,
+            'total_load_seconds': entry.total_load_seconds,
+        })
+    return stats
+
+
+def clear_cache():
+    with _lock:
+        _entries.clear()
+        _key_locks.clear()
+
+
+def _read_pickle(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def _read_csv(path):
+    import pandas as pd
+    return pd.read_csv(path)
+
+
+def _open_store(path):
+    from dataset_store import open_store
+    return open_store(path)
+
+
+def _read_training_data(path):
+    return load_raw_csv(path).dropna(subset=['RATAAN', 'S.BAKU', 'MIN'])
+
+
+def _read_artifact(path):
+    from compiled import load_artifact
+    return load_artifact(path)
+
+
+def _build_recommender(path):
+    from recommender import RECOMMENDER_COLUMNS, RecommendationIndex
+    return RecommendationIndex(load_store(path).frame(RECOMMENDER_COLUMNS))
+
+
+def _build_lookup(paths):
+    # paths = (artefak, dataset) atau (model, poly, dataset)
+    from core import Predictor
+    from lookup import LookupTable
+    if len(paths) == 2:
+        predictor = load_compiled(paths[0])
+    else:
+        predictor = Predictor(load_model(paths[0]), load_poly(paths[1]))
+    return LookupTable(predictor, load_recommender(paths[-1]))
+
+
+def _build_chart_specs(path):
+    from chart_data import CHART_COLUMNS, build_chart_specs
+    return build_chart_specs(load_store(path).frame(CHART_COLUMNS))
+
+
+def load_raw_csv(path='passing-grade.csv'):
+    return cached_load(path, _read_csv, name='csv')
+
+
+def load_store(path='passing-grade.csv'):
+    # Store kolumnar (dataset_store.py) untuk CSV ini; dibangun ulang bila CSV berubah
+    return cached_load(path, _open_store, name='store')
+
+
+def load_training_data(path='passing-grade.csv'):
+    # Dataset untuk pelatihan: baris tanpa MIN ikut dibuang
+    return cached_load(path, _read_training_data, name='training_data')
+
+
+def load_model(path='Lasso_Regression.sav'):
+    return cached_load(path, _read_pickle, name='model')
+
+
+def load_poly(path='polynomial_features.sav'):
+    return cached_load(path, _read_pickle, name='poly')
+
+
+def load_compiled(path='Lasso_Regression.json'):
+    # Artefak hasil compiled.py: evaluator NumPy tanpa pickle maupun scikit-learn
+    return cached_load(path, _read_artifact, name='compiled')
+
+
+def load_chart_specs(path='passing-grade.csv'):
+    # Spesifikasi grafik halaman "Tampilkan Grafik", dibangun ulang hanya bila dataset berubah
+    return cached_load(path, _build_chart_specs, name='chart_specs')
+
+
+def load_recommender(path='passing-grade.csv'):
+    # Indeks rekomendasi dibangun ulang hanya bila dataset berubah
+    return cached_load(path, _build_recommender, name='recommender')
+
+
+def load_lookup(data_path='passing-grade.csv', artifact_path='Lasso_Regression.json',
+                model_path='Lasso_Regression.sav', poly_path='polynomial_features.sav'):
+    # Tabel prediksi + rekomendasi untuk seluruh grid input bilangan bulat
+    # (lookup.py); dibangun ulang bila model atau dataset berubah
+    if artifact_path and os.path.exists(artifact_path):
+        paths = (artifact_path, data_path)
+    else:
+        paths = (model_path, poly_path, data_path)
+    return cached_load(paths, _build_lookup, name='lookup')
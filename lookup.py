@@ -0,0 +1,104 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import tracing
+from core import MAX_RATAAN, MAX_SBAKU
+
+# Tabel prediksi dan rekomendasi yang dihitung di muka. Halaman prediksi hanya
+# menerima RATAAN 0..800 dan S.BAKU 0..30 bilangan bulat (~25 ribu kombinasi),
+# jadi seluruh grid dievaluasi sekali dalam satu panggilan predict tervektorisasi
+# dan rekomendasi MIN terdekatnya dicari dengan nearest_min_batch. Tabel
+# dibangun ulang lewat loader.load_lookup bila artefak model atau dataset
+# berubah. Input di luar grid (nilai pecahan dari prediksi massal atau API)
+# dihitung model lalu disimpan di cache LRU per baris (RATAAN, S.BAKU).
+
+# Jumlah rekomendasi per sel; permintaan dengan k lebih besar memakai indeks rekomendasi
+TABLE_K = 20
+# Ukuran cache LRU untuk input di luar grid. Batch dengan lebih banyak baris di
+# luar grid dari ini langsung dihitung model tervektorisasi; menyimpannya hanya
+# akan mengusir seluruh isi cache.
+FALLBACK_CACHE_SIZE = 4096
+
+
+class LookupTable:
+    def __init__(self, predictor, recommender, k=TABLE_K, max_rataan=MAX_RATAAN, max_sbaku=MAX_SBAKU):
+        self.predictor = predictor
+        self.recommender = recommender
+        self.shape = (max_rataan + 1, max_sbaku + 1)
+        with tracing.span('lookup/build', cells=self.shape[0] * self.shape[1]):
+            grid = np.stack(np.meshgrid(np.arange(self.shape[0]), np.arange(self.shape[1]), indexing='ij'), axis=-1)
+            self.predictions = np.asarray(predictor.predict(grid.reshape(-1, 2)), dtype=np.float64).reshape(self.shape)
+            positions, _ = recommender.nearest_min_batch(self.predictions.ravel(), k)
+            self.positions = positions.astype(np.int32).reshape(*self.shape, -1)
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def __len__(self):
+        return self.predictions.size
+
+    def _cell(self, rataan, sbaku):
+        # Indeks grid untuk input bilangan bulat di dalam rentang, selain itu None
+        rataan, sbaku = float(rataan), float(sbaku)
+        if (rataan.is_integer() and sbaku.is_integer()
+                and 0 <= rataan < self.shape[0] and 0 <= sbaku < self.shape[1]):
+            return int(rataan), int(sbaku)
+        return None
+
+    def predict_one(self, rataan, sbaku):
+        cell = self._cell(rataan, sbaku)
+        if cell is None:
+            return float(self._fallback(np.array([[float(rataan), float(sbaku)]]))[0])
+        return float(self.predictions[cell])
+
+    def predict(self, features):
+        # Baris di grid diambil dari tabel; sisanya dihitung model dalam satu panggilan
+        features = np.asarray(features, dtype=float).reshape(-1, 2)
+        rataan, sbaku = features[:, 0], features[:, 1]
+        on_grid = (
+            (rataan == np.floor(rataan)) & (sbaku == np.floor(sbaku))
+            & (rataan >= 0) & (rataan < self.shape[0]) & (sbaku >= 0) & (sbaku < self.shape[1])
+        )
+        if not on_grid.any():
+            return self._fallback(features)
+        result = np.empty(len(features))
+        result[on_grid] = self.predictions[rataan[on_grid].astype(int), sbaku[on_grid].astype(int)]
+        if not on_grid.all():
+            result[~on_grid] = self._fallback(features[~on_grid])
+        return result
+
+    def _fallback(self, features):
+        # Prediksi model untuk baris di luar grid lewat cache LRU; baris yang belum
+        # ada di cache dihitung dalam satu panggilan predict
+        if len(features) > FALLBACK_CACHE_SIZE:
+            return np.asarray(self.predictor.predict(features), dtype=float)
+        keys = [tuple(row) for row in features.tolist()]
+        result = np.empty(len(keys))
+        missing = []
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                value = self._cache.get(key)
+                if value is None:
+                    missing.append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    result[i] = value
+        if missing:
+            values = np.asarray(self.predictor.predict(features[missing]), dtype=float)
+            result[missing] = values
+            with self._cache_lock:
+                for i, value in zip(missing, values.tolist()):
+                    self._cache[keys[i]] = value
+                while len(self._cache) > FALLBACK_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return result
+
+    def nearest_min(self, rataan, sbaku, predicted_min, k=5):
+        # Rekomendasi MIN terdekat tanpa filter dari tabel, atau None bila input
+        # di luar grid, k melebihi tabel, atau prediksinya bukan dari tabel ini
+        cell = self._cell(rataan, sbaku)
+        if cell is None or k > self.positions.shape[2] or self.predictions[cell] != predicted_min:
+            return None
+        positions = self.positions[cell][:k]
+        return self.recommender.result(positions, np.abs(self.recommender.mins(positions) - predicted_min))
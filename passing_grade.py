@@ -1,43 +1,61 @@
-import pickle
+import os
+import tempfile
+import time
+from collections import deque
 import streamlit as st
-import pandas as pd
-import altair as alt
-from sklearn.linear_model import LinearRegression, Ridge, Lasso
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error
-from sklearn.preprocessing import PolynomialFeatures
+
+import tracing
+
+# Dependensi berat (pandas, altair, scikit-learn) di-import di dalam halaman yang
+# memakainya, sehingga halaman Home tidak ikut menanggung biaya import-nya dan
+# modul khusus pelatihan hanya dimuat saat halaman Modelling dibuka.
 
 def load_data():
-    df = pd.read_csv('passing-grade.csv')
-    df = df.dropna(subset=['RATAAN', 'S.BAKU', 'MIN'])
-    return df
-
-# Memuat model prediksi passing grade dari file .sav
-try:
-    model = pickle.load(open('Lasso_Regression.sav', 'rb'))
-    poly = pickle.load(open('polynomial_features.sav', 'rb'))
-except FileNotFoundError:
-    st.error("File model tidak ditemukan. Pastikan file tersebut ada.")
-    model = None
-    poly = None
-
-# Membaca file CSV untuk dataset
-try:
-    df_passing_grade = pd.read_csv('passing-grade.csv')
-    df_passing_grade.reset_index(inplace=True)
-    df_passing_grade.dropna(subset=['RATAAN', 'S.BAKU'], inplace=True)
-except FileNotFoundError:
-    st.error("File 'passing-grade.csv' tidak ditemukan. Pastikan file tersebut ada.")
-    df_passing_grade = None
+    from loader import load_training_data
+    return load_training_data('passing-grade.csv')
+
+def get_predictor():
+    # Memuat model prediksi passing grade (di-cache per proses). Artefak terkompilasi
+    # dipakai bila ada, sehingga halaman prediksi tidak perlu memuat scikit-learn.
+    from core import load_predictor
+    try:
+        return load_predictor('Lasso_Regression.sav', 'polynomial_features.sav', 'Lasso_Regression.json')
+    except FileNotFoundError:
+        st.error("File model tidak ditemukan. Pastikan file tersebut ada.")
+        return None
+
+def get_lookup():
+    # Tabel prediksi + rekomendasi untuk seluruh grid input (lookup.py), dibangun
+    # ulang bila model atau dataset berubah; None bila salah satunya tidak ada
+    from loader import load_lookup
+    try:
+        return load_lookup('passing-grade.csv', 'Lasso_Regression.json', 'Lasso_Regression.sav', 'polynomial_features.sav')
+    except FileNotFoundError:
+        return None
+
+def get_store():
+    # Store kolumnar dataset (di-cache per proses, dibangun ulang bila CSV berubah);
+    # halaman hanya membaca kolom dan rentang baris yang ditampilkan
+    from loader import load_store
+    try:
+        return load_store('passing-grade.csv')
+    except FileNotFoundError:
+        st.error("File 'passing-grade.csv' tidak ditemukan. Pastikan file tersebut ada.")
+        return None
 
 # Sidebar untuk navigasi
 st.sidebar.header("Navigasi")
 menu_option = st.sidebar.selectbox(
     "Pilih menu:",
-    ["Home","Lihat Dataset", "Tampilkan Grafik", "Prediksi Passing Grade", "Modelling"]
+    ["Home","Lihat Dataset", "Tampilkan Grafik", "Prediksi Passing Grade", "Prediksi Massal", "Modelling"]
 )
 
+# Timing per tahap untuk rerun ini (lihat tracing.py); hampir tanpa biaya bila nonaktif
+rerun_spans = []
+if tracing.enabled:
+    tracing.set_collector(rerun_spans)
+page_start = time.perf_counter()
+
 # Fungsi untuk halaman utama / About Us
 if menu_option == "Home":
     st.image("fotoptn.jpg", caption="Aplikasi Prediksi Passing Grade")
@@ -109,7 +127,8 @@ if menu_option == "Home":
 
 # Fungsi untuk menampilkan dataset
 elif menu_option == "Lihat Dataset":
-    if df_passing_grade is not None:
+    store = get_store()
+    if store is not None:
         st.header("📊 Dataset Passing Grade")
         st.write("### Data Passing Grade")
         st.markdown("""
@@ -121,21 +140,33 @@ elif menu_option == "Lihat Dataset":
         5. *PTN*: Nama Perguruan Tinggi Negeri.
         6. *NAMA PRODI*: Nama program studi.
         """)
-        st.dataframe(df_passing_grade)
+        # Tabel ditampilkan per halaman agar hanya baris yang terlihat yang dibaca
+        col_ukuran, col_halaman = st.columns(2)
+        with col_ukuran:
+            ukuran_halaman = st.number_input('Baris per halaman', min_value=10, max_value=5000, value=500, step=10)
+        jumlah_halaman = max(1, -(-len(store) // ukuran_halaman))
+        with col_halaman:
+            halaman = st.number_input(f'Halaman (1-{jumlah_halaman})', min_value=1, max_value=jumlah_halaman, value=1)
+        awal = (halaman - 1) * ukuran_halaman
+        st.dataframe(store.frame(start=awal, stop=awal + ukuran_halaman))
+        st.caption(f"Menampilkan baris {awal + 1:,}-{min(awal + ukuran_halaman, len(store)):,} dari {len(store):,}")
     else:
         st.warning("Dataset tidak tersedia.")
 
 # Fungsi untuk menampilkan grafik
 elif menu_option == "Tampilkan Grafik":
-    if df_passing_grade is not None:
+    from loader import load_chart_specs
+
+    # Data dan spesifikasi grafik di-cache sampai dataset berubah
+    try:
+        chart_specs = load_chart_specs('passing-grade.csv')
+    except FileNotFoundError:
+        st.error("File 'passing-grade.csv' tidak ditemukan. Pastikan file tersebut ada.")
+        chart_specs = None
+    if chart_specs is not None:
         # Grafik RATAAN
         st.write("### Grafik Nilai RATAAN")
-        chart_rataan = alt.Chart(df_passing_grade).mark_line().encode(
-            x=alt.X('index:Q', title='Index'),
-            y=alt.Y('RATAAN:Q', title='Nilai RATAAN'),
-            tooltip=['index', 'RATAAN']
-        ).properties(title='Perubahan Nilai RATAAN')
-        st.altair_chart(chart_rataan, use_container_width=True)
+        st.vega_lite_chart(chart_specs['rataan'], use_container_width=True)
         st.write("Sumbu X (Index) : Menunjukkan index atau urutan data, mulai dari 0 hingga sekitar 480.",
         "Setiap nilai pada sumbu ini merepresentasikan data yang berurutan dalam dataset.")
         st.write("Sumbu Y (Nilai RATAAN) : Menunjukkan nilai rata-rata, dengan skala mulai dari sekitar 600 hingga 800.",
@@ -143,18 +174,7 @@ elif menu_option == "Tampilkan Grafik":
         
         # Grafik Hubungan RATAAN, MIN, dan MAX
         st.write("### Grafik Hubungan antara RATAAN, MIN, dan MAX")
-        line_chart = alt.Chart(df_passing_grade).mark_line().encode(
-            x=alt.X('RATAAN:Q', title='Nilai RATAAN'),
-            y=alt.Y('MIN:Q', title='Nilai MIN'),
-            tooltip=['RATAAN', 'MIN']
-        ).properties(title='Hubungan antara RATAAN dan Nilai MIN')
-        line_chart_max = alt.Chart(df_passing_grade).mark_line(color='red').encode(
-            x=alt.X('RATAAN:Q', title='Nilai RATAAN'),
-            y=alt.Y('MAX:Q', title='Nilai MAX'),
-            tooltip=['RATAAN', 'MAX']
-        )
-        combined_chart = line_chart + line_chart_max
-        st.altair_chart(combined_chart, use_container_width=True)
+        st.vega_lite_chart(chart_specs['relation'], use_container_width=True)
         st.write("Sumbu X (Nilai RATAAN) menunjukkan nilai rata-rata passing grade yang dihitung dari data passing grade suatu program studi atau institusi.", 
         "Ini merepresentasikan rata-rata nilai yang dicapai atau diperlukan oleh calon mahasiswa untuk memenuhi syarat lulus atau diterima di program studi tersebut.")
         st.write("Sumbu Y (Nilai MIN dan MAX) menunjukkan nilai passing grade minimum (yang ditunjukkan oleh garis biru) adalah nilai minimum yang harus dicapai oleh calon mahasiswa untuk dapat diterima di suatu program studi atau universitas.",
@@ -163,26 +183,8 @@ elif menu_option == "Tampilkan Grafik":
 
         # Grafik 10 Prodi dengan Passing Grade Tertinggi
         st.write("### Sebaran 10 Prodi dengan Nilai Passing Grade Tertinggi")
-        if df_passing_grade is not None and not df_passing_grade.empty:
-            top_10_best_programs = df_passing_grade.nlargest(10, 'MIN')
-            top_10_best_programs['PRODI_PTN'] = top_10_best_programs['NAMA PRODI'] + " - " + top_10_best_programs['PTN']
-            
-            best_programs_chart = alt.Chart(top_10_best_programs).mark_bar().encode(
-                x=alt.X('PRODI_PTN:N', title='Nama Prodi - PTN', sort='-y'),
-                y=alt.Y('MIN:Q', title='Nilai Passing Grade (MIN)'),
-                color=alt.Color('PTN:N', title='PTN', legend=alt.Legend(orient='bottom')),
-                tooltip=['NAMA PRODI', 'PTN', alt.Tooltip('MIN:Q', title='Passing Grade (MIN)', format='.2f')]
-            ).properties(
-                title='Sebaran 10 Prodi dengan Nilai Passing Grade Tertinggi',
-                width='container',
-                height=500
-            ).configure_axisX(
-                labelAngle=-45
-            ).configure_title(
-                fontSize=16,
-                anchor='start'
-            )
-            st.altair_chart(best_programs_chart, use_container_width=True)
+        if chart_specs['top10'] is not None:
+            st.vega_lite_chart(chart_specs['top10'], use_container_width=True)
             st.write("Grafik ini memberikan gambaran program studi yang memiliki nilai passing grade terbaik di beberapa PTN. Dari grafik ini dapat disimpulkan:")
             st.write("- **Kompetisi Tinggi:** Program studi dengan nilai passing grade tinggi menandakan adanya persaingan yang ketat untuk mendapatkan program studi tersebut. Hal ini dipengaruhi oleh reputasi program studi, peluang kerja lulusan, serta minat calon mahasiswa terhadap program studi tersebut.") 
             st.write("- **Variasi Antar PTN:** Meskipun program studi sama, nilai passing gradenya berbeda-beda di setiap PTN. Perbedaan ini dipengaruhi oleh beberapa faktor seperti reputasi PTN, fasilitas yang dimiliki, lokasi PTN, serta kebijakan penerimaan mahasiswa baru yang diterapkan oleh masing-masing PTN.") 
@@ -192,26 +194,8 @@ elif menu_option == "Tampilkan Grafik":
             
         # Grafik 10 Prodi dengan Passing Grade Terendah
         st.write("### Sebaran 10 Prodi dengan Nilai Passing Grade Terendah")
-        if df_passing_grade is not None and not df_passing_grade.empty:
-            top_10_lowest_programs = df_passing_grade.nsmallest(10, 'MIN')
-            top_10_lowest_programs['PRODI_PTN'] = top_10_lowest_programs['NAMA PRODI'] + " - " + top_10_lowest_programs['PTN']
-            
-            lowest_programs_chart = alt.Chart(top_10_lowest_programs).mark_bar().encode(
-                x=alt.X('PRODI_PTN:N', title='Nama Prodi - PTN', sort='-y'),
-                y=alt.Y('MIN:Q', title='Nilai Passing Grade (MIN)'),
-                color=alt.Color('PTN:N', title='PTN', legend=alt.Legend(orient='bottom')),
-                tooltip=['NAMA PRODI', 'PTN', alt.Tooltip('MIN:Q', title='Passing Grade (MIN)', format='.2f')]
-            ).properties(
-                title='Sebaran 10 Prodi dengan Nilai Passing Grade Terendah',
-                width='container',
-                height=500
-            ).configure_axisX(
-                labelAngle=-45
-            ).configure_title(
-                fontSize=16,
-                anchor='start'
-            )
-            st.altair_chart(lowest_programs_chart, use_container_width=True)
+        if chart_specs['bottom10'] is not None:
+            st.vega_lite_chart(chart_specs['bottom10'], use_container_width=True)
             st.write("Grafik ini memberikan gambaran program studi yang memiliki nilai passing grade terendah di beberapa PTN. Dari grafik ini dapat disimpulkan:")
             st.write("- **Persaingan Rendah:** Program studi dengan nilai passing grade rendah cenderung memiliki persaingan yang lebih sedikit dibandingkan program studi dengan passing grade tinggi. Hal ini mungkin karena minat yang lebih rendah dari calon mahasiswa atau karakteristik program studi tersebut.") 
             st.write("- **Variasi Antar PTN:** Seperti pada nilai passing grade tinggi, terdapat variasi nilai passing grade yang rendah antar PTN. Faktor-faktor seperti reputasi PTN dan daya tarik lokasi PTN masih berpengaruh pada nilai ini.") 
@@ -222,6 +206,9 @@ elif menu_option == "Tampilkan Grafik":
 
 # Fungsi untuk melakukan prediksi
 elif menu_option == "Prediksi Passing Grade":
+    from core import METHOD_MIN, METHOD_PROFILE, recommend
+    from loader import load_recommender
+
     st.header("🔮 Prediksi Passing Grade")
     
     st.write("### Masukkan Data untuk Prediksi")
@@ -231,6 +218,13 @@ elif menu_option == "Prediksi Passing Grade":
     st.write("### Informasi PTN dan Prodi")
     selected_ptn = st.text_input("Masukkan PTN (misal: Universitas Indonesia)")
     selected_prodi = st.text_input("Masukkan Prodi (misal: Teknik Informatika)")
+
+    st.write("### Pengaturan Rekomendasi")
+    jumlah_rekomendasi = st.number_input('Jumlah rekomendasi', min_value=1, max_value=50, value=5)
+    metode_rekomendasi = st.radio(
+        "Metode rekomendasi:",
+        ["Passing Grade (MIN) terdekat", "Kemiripan RATAAN, S.BAKU, dan MIN"]
+    )
     
     if st.button('Prediksi'):
         if rataan <= 0:
@@ -242,11 +236,12 @@ elif menu_option == "Prediksi Passing Grade":
         elif not selected_prodi.strip():
             st.error("Prodi wajib diisi!")
         else:
-            if model and poly:
+            lookup = get_lookup()
+            predictor = lookup if lookup is not None else get_predictor()
+            if predictor is not None:
                 try:
-                    input_features = poly.transform([[rataan, sbaku]])
-                    passing_grade_prediction = model.predict(input_features)
-                    predicted_min = float(passing_grade_prediction[0])
+                    with tracing.span('predict'):
+                        predicted_min = predictor.predict_one(rataan, sbaku)
 
                     st.write(f"**Prediksi Passing Grade (MIN)** untuk PTN **{selected_ptn.upper()}** dan Prodi **{selected_prodi.upper()}**:")
                     st.success(f"**{predicted_min:.2f}**")
@@ -255,16 +250,23 @@ elif menu_option == "Prediksi Passing Grade":
                     Pastikan untuk mempersiapkan dengan baik!
                     """)
 
-                    # Mencari 5 PTN dan Prodi dengan passing grade terdekat
-                    st.subheader("🎓 Rekomendasi PTN dan Prodi")
+                    # Mencari PTN dan Prodi dengan passing grade terdekat lewat indeks rekomendasi
+                    st.subheader("🎓 Rekomendasi PTN dan Prodi")
                     st.write("""
                     Berikut merupakan rekomendasi Perguruan Tinggi Negeri dan Program Studi,
                     berdasarkan Prediksi Passing Grade (MIN) :
                     """)
-                    if df_passing_grade is not None:
-                        df_passing_grade['selisih'] = abs(df_passing_grade['MIN'] - predicted_min)
-                        top_recommendations = df_passing_grade.nsmallest(5, 'selisih')
-                        top_recommendations_table = top_recommendations[['PTN', 'NAMA PRODI', 'MIN']]
+                    if get_store() is not None:
+                        metode = METHOD_MIN if metode_rekomendasi == "Passing Grade (MIN) terdekat" else METHOD_PROFILE
+                        top_recommendations, catatan = recommend(
+                            load_recommender('passing-grade.csv'), predicted_min, k=jumlah_rekomendasi,
+                            ptn=selected_ptn, prodi=selected_prodi, method=metode, rataan=rataan, sbaku=sbaku,
+                            lookup=lookup,
+                        )
+                        if catatan:
+                            st.info(catatan)
+
+                        top_recommendations_table = top_recommendations[['PTN', 'NAMA PRODI', 'MIN']].copy()
                         top_recommendations_table['Passing Grade (MIN) Terdekat'] = top_recommendations_table['MIN'].apply(lambda x: f"{x:.2f}")
                         st.table(top_recommendations_table[['PTN', 'NAMA PRODI', 'Passing Grade (MIN) Terdekat']])
 
@@ -273,8 +275,52 @@ elif menu_option == "Prediksi Passing Grade":
             else:
                 st.error("Model atau PolynomialFeatures tidak tersedia. Pastikan file berhasil dimuat.")
 
+# Fungsi untuk prediksi massal dari file
+elif menu_option == "Prediksi Massal":
+    from batch import run_batch
+    from loader import load_recommender
+
+    st.header("📂 Prediksi Massal")
+    st.write("""
+    Unggah file CSV atau Parquet berisi kolom **RATAAN** dan **S.BAKU** untuk memprediksi passing grade banyak siswa sekaligus.
+    File diproses per potongan, dan baris yang tidak valid diberi keterangan pada kolom **KETERANGAN**.
+    """)
+    uploaded_file = st.file_uploader("Unggah file", type=['csv', 'parquet'])
+    jumlah_rekomendasi = st.number_input('Jumlah rekomendasi per siswa', min_value=0, max_value=20, value=5)
+
+    if uploaded_file is not None and st.button('Proses File'):
+        # Baris dengan nilai bulat diambil dari tabel grid, sisanya dihitung model
+        lookup = get_lookup()
+        predictor = lookup if lookup is not None else get_predictor()
+        if predictor is not None:
+            recommender = load_recommender('passing-grade.csv') if get_store() is not None else None
+            progress_text = st.empty()
+            # Hasil ditulis ke file sementara di disk, bukan ditampung di memori
+            output = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, newline='')
+            try:
+                with output:
+                    stats = run_batch(
+                        uploaded_file, uploaded_file.name, output, predictor, recommender,
+                        k=jumlah_rekomendasi,
+                        progress=lambda s: progress_text.write(f"{s['rows']:,} baris diproses ({s['rows_per_sec']:,.0f} baris/detik)"),
+                    )
+                st.success(
+                    f"{stats['rows']:,} baris diproses dalam {stats['seconds']:.2f} detik "
+                    f"({stats['rows_per_sec']:,.0f} baris/detik): {stats['valid']:,} valid, {stats['invalid']:,} tidak valid."
+                )
+                with open(output.name, 'rb') as f:
+                    st.download_button("Unduh Hasil Prediksi", f, file_name='hasil_prediksi.csv', mime='text/csv')
+            except ValueError as e:
+                st.error(f"File tidak dapat diproses: {e}")
+            finally:
+                os.remove(output.name)
+        else:
+            st.error("Model atau PolynomialFeatures tidak tersedia. Pastikan file berhasil dimuat.")
+
 # Fungsi untuk melatih model
 elif menu_option == "Modelling":
+    from training import TrainingJob
+
     st.header("🛠️ Modelling")
     st.write("### Melatih Model Prediksi Passing Grade")
     
@@ -297,49 +343,104 @@ elif menu_option == "Modelling":
     """)
 
     if st.button('Latih Model'):
-        df = load_data()
-        
-        poly = PolynomialFeatures(degree=2, include_bias=False)
-        X_poly = poly.fit_transform(df[['RATAAN', 'S.BAKU']])
-        y = df['MIN']
-        X_train, X_test, y_train, y_test = train_test_split(X_poly, y, test_size=0.2, random_state=42)
-
-        models = {
-            "Linear Regression": LinearRegression(),
-            "Ridge Regression": Ridge(alpha=1.0),
-            "Lasso Regression": Lasso(alpha=0.1),
-            "Random Forest Regressor": RandomForestRegressor(n_estimators=100, random_state=42),
-            "Gradient Boosting Regressor": GradientBoostingRegressor(n_estimators=100, random_state=42)
-        }
-
-        mse_results = {}
-        best_model_name = None
-        best_model = None
-        best_mse = float('inf')
-
-        with st.spinner('Melatih model...'):
-            for model_name, model in models.items():
-                model.fit(X_train, y_train)
-                y_pred = model.predict(X_test)
-                mse = mean_squared_error(y_test, y_pred)
-                mse_results[model_name] = mse
-
-                if mse < best_mse:
-                    best_mse = mse
-                    best_model_name = model_name
-                    best_model = model
+        job = st.session_state.get('training_job')
+        if job is None or job.done:
+            # Pelatihan berjalan di latar belakang; halaman hanya menampilkan progresnya
+            st.session_state['training_job'] = TrainingJob(load_data()).start()
+
+    job = st.session_state.get('training_job')
+    if job is not None:
+        st.progress(job.fraction_done(), text=f"Melatih model... ({job.elapsed():.1f} detik)" if not job.done else "Pelatihan selesai")
 
         st.write("\n### MSE Results:")
-        cols = st.columns(len(models))
-        for i, (model_name, mse) in enumerate(mse_results.items()):
+        progress = job.progress()
+        cols = st.columns(len(progress))
+        for i, (model_name, result) in enumerate(progress.items()):
             with cols[i]:
-                st.metric(label=model_name, value=f"{mse:.2f}", delta=None)
-
-        if best_model is not None:
-            with open('passing_grade_model.sav', 'wb') as f:
-                pickle.dump(best_model, f)
-            with open('polynomial_features.sav', 'wb') as f:
-                pickle.dump(poly, f)
-            st.success(f"Model terbaik '{best_model_name}' berhasil dilatih dan disimpan.")
+                mse = result['mse']
+                st.metric(label=model_name, value=f"{mse:.2f}" if mse is not None else "-", delta=None)
+                st.caption(
+                    f"Fold {result['folds_done']}/{result['n_folds']}  \n"
+                    f"Wall {result['wall_seconds']:.2f} s · CPU {result['cpu_seconds']:.2f} s"
+                )
+
+        if not job.done:
+            time.sleep(0.5)
+            st.rerun()
+        elif job.error is not None:
+            st.error(f"Terjadi kesalahan saat melatih model: {job.error}")
+        elif job.best_model_name is not None:
+            st.success(f"Model terbaik '{job.best_model_name}' berhasil dilatih dan disimpan ({job.elapsed():.1f} detik).")
         else:
             st.error("Tidak ada model yang berhasil dilatih.")
+
+    st.write("---")
+    st.write("### Pembaruan Inkremental")
+    st.write("""
+    Baris passing grade baru (minimal kolom **RATAAN**, **S.BAKU**, dan **MIN**) bisa ditambahkan tanpa melatih ulang
+    semua model. Baris disimpan terpisah dari dataset (tidak muncul di tampilan dataset, grafik, maupun rekomendasi),
+    lalu model linear yang sedang dipakai diperbarui dari statistik yang tersimpan, sehingga waktunya sebanding
+    dengan jumlah baris baru. Refit penuh dijalankan berkala atau bila galat
+    pada data baru jauh lebih besar dari biasanya (drift). Model baru langsung dipakai untuk prediksi berikutnya.
+    """)
+    from incremental import get_updater
+
+    baris_baru = st.file_uploader("Unggah baris baru (CSV atau Parquet)", type=['csv', 'parquet'], key='incremental_file')
+    col_update, col_refit = st.columns(2)
+    try:
+        updater = get_updater('passing-grade.csv', 'Lasso_Regression.json')
+        hasil_refit = None
+        if col_update.button('Perbarui Model', disabled=baris_baru is None):
+            import pandas as pd
+            rows = pd.read_parquet(baris_baru) if baris_baru.name.endswith('.parquet') else pd.read_csv(baris_baru)
+            with st.spinner("Memperbarui model..."):
+                hasil = updater.update(rows)
+            st.success(
+                f"{hasil['rows']:,} baris ditambahkan, {hasil['invalid']:,} baris ditolak "
+                f"({hasil['seconds'] * 1000:.0f} ms)."
+            )
+            col1, col2, col3 = st.columns(3)
+            col1.metric("MSE batch baru (sebelum pembaruan)", f"{hasil['batch_mse']:.2f}" if hasil['batch_mse'] is not None else "-")
+            col2.metric("MSE data latih", f"{hasil['train_mse']:.2f}")
+            col3.metric("Total baris", f"{hasil['total_rows']:,}")
+            hasil_refit = hasil['refit']
+        if col_refit.button('Refit Penuh'):
+            with st.spinner("Menjalankan refit penuh..."):
+                hasil_refit = updater.refit()
+        if hasil_refit is not None:
+            st.info(
+                f"Refit penuh ({hasil_refit['reason']}) pada {hasil_refit['rows']:,} baris: "
+                f"MSE {hasil_refit['train_mse']:.2f}, pergeseran prediksi maksimum "
+                f"{hasil_refit['max_prediction_shift']:.4f}."
+            )
+        status = updater.status()
+        if status is not None:
+            st.caption(
+                f"Model {status['model']} · {status['total_rows']:,} baris · "
+                f"{status['rows_since_refit']:,} baris sejak refit penuh terakhir"
+            )
+    except FileNotFoundError:
+        st.error("File model atau dataset tidak ditemukan. Pastikan file tersebut ada.")
+    except ValueError as e:
+        st.error(f"Pembaruan inkremental gagal: {e}")
+
+tracing.record(f"page/{menu_option}", time.perf_counter() - page_start)
+
+# Panel debug (PASSING_GRADE_DEBUG=1): timing sesi ini, agregat proses, dan status cache
+if tracing.debug:
+    from loader import cache_stats
+
+    session_spans = st.session_state.setdefault('trace_spans', deque(maxlen=2000))
+    session_spans.extend(rerun_spans)
+    with st.sidebar.expander("🔧 Debug: Timing"):
+        st.write("**Rerun terakhir (ms)**")
+        st.table([{'tahap': stage, 'ms': round(ms, 3)} for stage, ms in rerun_spans])
+        st.write("**Sesi ini (ms)**")
+        session_samples = {}
+        for stage, ms in session_spans:
+            session_samples.setdefault(stage, []).append(ms)
+        st.table([{'tahap': stage, **summary} for stage, summary in tracing.summarize(session_samples).items()])
+        st.write("**Semua sesi di proses ini (ms)**")
+        st.table([{'tahap': stage, **summary} for stage, summary in tracing.aggregates().items()])
+        st.write("**Cache loader**")
+        st.table(cache_stats())
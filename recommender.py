@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+
+SPATIAL_COLUMNS = ['RATAAN', 'S.BAKU', 'MIN']
+RESULT_COLUMNS = ['PTN', 'NAMA PRODI', 'RATAAN', 'S.BAKU', 'MIN']
+# Kolom yang perlu dibaca dari store untuk membangun indeks
+RECOMMENDER_COLUMNS = RESULT_COLUMNS
+
+
+def normalize_name(text):
+    # Nama PTN/prodi dibandingkan tanpa memedulikan huruf besar dan spasi ganda
+    return ' '.join(str(text).upper().split())
+
+
+class SortedMinIndex:
+    # Indeks terurut atas kolom MIN: k tetangga terdekat dari sebuah nilai
+    # berada di jendela [i - k, i + k) sekitar titik sisipnya, jadi pencarian
+    # cukup O(log n + k) tanpa memindai seluruh tabel.
+
+    def __init__(self, positions, values):
+        order = np.argsort(values, kind='stable')
+        self.positions = np.asarray(positions)[order]
+        self.values = np.asarray(values, dtype=float)[order]
+
+    def __len__(self):
+        return len(self.values)
+
+    def nearest(self, target, k):
+        n = len(self.values)
+        k = min(k, n)
+        if k <= 0:
+            return self.positions[:0], self.values[:0]
+        i = int(np.searchsorted(self.values, target))
+        lo, hi = max(0, i - k), min(n, i + k)
+        distances = np.abs(self.values[lo:hi] - target)
+        pick = np.argsort(distances, kind='stable')[:k]
+        return self.positions[lo:hi][pick], distances[pick]
+
+    def nearest_many(self, targets, k):
+        # Versi tervektorisasi untuk banyak target sekaligus: setiap target
+        # hanya membandingkan 2k kandidat di sekitar titik sisipnya.
+        targets = np.asarray(targets, dtype=float)
+        n = len(self.values)
+        k = min(k, n)
+        if k <= 0:
+            empty = np.empty((len(targets), 0))
+            return empty.astype(self.positions.dtype), empty
+        i = np.searchsorted(self.values, targets)
+        window = i[:, None] + np.arange(-k, k)
+        inside = (window >= 0) & (window < n)
+        window = np.clip(window, 0, n - 1)
+        distances = np.where(inside, np.abs(self.values[window] - targets[:, None]), np.inf)
+        pick = np.argsort(distances, axis=1, kind='stable')[:, :k]
+        rows = np.arange(len(targets))[:, None]
+        return self.positions[window[rows, pick]], distances[rows, pick]
+
+
+class RecommendationIndex:
+    # Indeks rekomendasi yang dibangun sekali per versi dataset. Frame sumber
+    # hanya dibaca; hasil selalu berupa frame baru.
+
+    def __init__(self, df):
+        self._df = df
+        # Baris tanpa nama PTN atau prodi (mis. dari pembaruan inkremental) tidak bisa direkomendasikan
+        named = (
+            (df['PTN'].astype(str).str.strip() != '') & df['PTN'].notna()
+            & (df['NAMA PRODI'].astype(str).str.strip() != '') & df['NAMA PRODI'].notna()
+        ).to_numpy()
+        mins = df['MIN'].to_numpy(dtype=float)
+        positions = np.flatnonzero(~np.isnan(mins) & named)
+        mins = mins[positions]
+
+        self._all = SortedMinIndex(positions, mins)
+        ptn_keys = df['PTN'].iloc[positions].map(normalize_name).to_numpy()
+        prodi_keys = df['NAMA PRODI'].iloc[positions].map(normalize_name).to_numpy()
+        self._by_ptn = self._group(positions, mins, ptn_keys)
+        self._by_prodi = self._group(positions, mins, prodi_keys)
+        self._by_pair = self._group(positions, mins, [ptn_keys, prodi_keys])
+
+        features = df[SPATIAL_COLUMNS].to_numpy(dtype=float)
+        complete = ~np.isnan(features).any(axis=1) & named
+        self._spatial_positions = np.flatnonzero(complete)
+        self._spatial_row = np.full(len(df), -1)
+        self._spatial_row[self._spatial_positions] = np.arange(len(self._spatial_positions))
+        features = features[complete]
+        self._mean = features.mean(axis=0) if len(features) else np.zeros(3)
+        std = features.std(axis=0) if len(features) else np.ones(3)
+        self._scale = np.where(std > 0, std, 1.0)
+        self._spatial_features = (features - self._mean) / self._scale
+        self._tree = None
+        self._labels = None
+
+    def __len__(self):
+        return len(self._all)
+
+    @staticmethod
+    def _group(positions, mins, keys):
+        groups = pd.Series(np.arange(len(positions))).groupby(keys, sort=False).indices
+        return {
+            key: SortedMinIndex(positions[idx], mins[idx])
+            for key, idx in groups.items()
+        }
+
+    @staticmethod
+    def _match(query, index):
+        # Cocokkan persis dulu, kalau tidak ada pakai pencocokan substring
+        query = normalize_name(query)
+        if query in index:
+            return [query]
+        return [key for key in index if query in key]
+
+    def _sub_indexes(self, ptn=None, prodi=None):
+        ptn = ptn if ptn and ptn.strip() else None
+        prodi = prodi if prodi and prodi.strip() else None
+        if ptn is None and prodi is None:
+            return [self._all]
+        if prodi is None:
+            return [self._by_ptn[key] for key in self._match(ptn, self._by_ptn)]
+        if ptn is None:
+            return [self._by_prodi[key] for key in self._match(prodi, self._by_prodi)]
+        ptn_keys = self._match(ptn, self._by_ptn)
+        prodi_keys = self._match(prodi, self._by_prodi)
+        return [
+            self._by_pair[(a, b)]
+            for a in ptn_keys for b in prodi_keys
+            if (a, b) in self._by_pair
+        ]
+
+    def result(self, positions, distances):
+        # Frame hasil untuk posisi baris dan selisihnya (juga dipakai lookup.py)
+        result = self._df.iloc[positions][RESULT_COLUMNS].copy()
+        result['selisih'] = distances
+        return result
+
+    def nearest_min(self, predicted_min, k=5, ptn=None, prodi=None):
+        # k prodi dengan MIN terdekat ke nilai prediksi, opsional difilter PTN/prodi
+        found_positions, found_distances = [], []
+        for index in self._sub_indexes(ptn, prodi):
+            positions, distances = index.nearest(predicted_min, k)
+            found_positions.append(positions)
+            found_distances.append(distances)
+        if not found_positions:
+            return self.result(np.empty(0, dtype=int), np.empty(0))
+        positions = np.concatenate(found_positions)
+        distances = np.concatenate(found_distances)
+        pick = np.argsort(distances, kind='stable')[:k]
+        return self.result(positions[pick], distances[pick])
+
+    def nearest_min_batch(self, predicted_mins, k=5):
+        # Posisi baris dan selisih k rekomendasi untuk setiap prediksi, bentuk (m, k)
+        return self._all.nearest_many(predicted_mins, k)
+
+    def names(self, positions):
+        # Label "NAMA PRODI - PTN" untuk posisi baris (bentuk array dipertahankan)
+        if self._labels is None:
+            self._labels = (self._df['NAMA PRODI'].astype(str) + " - " + self._df['PTN'].astype(str)).to_numpy()
+        return self._labels[np.asarray(positions)]
+
+    def mins(self, positions):
+        return self._df['MIN'].to_numpy(dtype=float)[np.asarray(positions)]
+
+    def nearest_profile(self, rataan, sbaku, predicted_min, k=5, ptn=None, prodi=None):
+        # k prodi terdekat di ruang (RATAAN, S.BAKU, MIN) yang sudah distandarkan
+        query = (np.array([rataan, sbaku, predicted_min], dtype=float) - self._mean) / self._scale
+        if not (ptn and ptn.strip()) and not (prodi and prodi.strip()):
+            k = min(k, len(self._spatial_positions))
+            if k <= 0:
+                return self.result(np.empty(0, dtype=int), np.empty(0))
+            distances, idx = self._spatial_tree().query(query[None, :], k=k)
+            return self.result(self._spatial_positions[idx[0]], distances[0])
+
+        # Dengan filter, kandidat cukup diambil dari sub-indeks PTN/prodi
+        sub_indexes = self._sub_indexes(ptn, prodi)
+        if not sub_indexes:
+            return self.result(np.empty(0, dtype=int), np.empty(0))
+        candidates = np.concatenate([index.positions for index in sub_indexes])
+        rows = self._spatial_row[candidates]
+        rows = rows[rows >= 0]
+        distances = np.linalg.norm(self._spatial_features[rows] - query, axis=1)
+        pick = np.argsort(distances, kind='stable')[:k]
+        return self.result(self._spatial_positions[rows[pick]], distances[pick])
+
+    def _spatial_tree(self):
+        if self._tree is None:
+            from sklearn.neighbors import KDTree
+            self._tree = KDTree(self._spatial_features)
+        return self._tree
@@ -0,0 +1,300 @@
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from core import METHOD_MIN, METHOD_PROFILE, ReloadingPredictor, recommend, validate_scores
+import tracing
+from loader import load_recommender
+
+# Layanan HTTP tanpa antarmuka untuk prediksi dan rekomendasi passing grade.
+# Model dimuat lewat cache loader (artefak terkompilasi bila ada, tanpa pickle);
+# permintaan yang datang bersamaan digabung menjadi micro-batch sehingga cukup
+# satu panggilan predict per batch.
+#
+#   python server.py --port 8600 --max-batch-size 256 --max-wait-ms 2
+#
+#   POST /predict    {"rataan": 700, "sbaku": 20}  atau  {"inputs": [[700, 20], ...]}
+#   POST /recommend  {"rataan": 700, "sbaku": 20, "k": 5, "ptn": "...", "prodi": "...", "method": "min"}
+#   GET  /health
+
+MAX_BODY_BYTES = 1 << 20
+
+
+class MicroBatcher:
+    # Mengumpulkan baris input dari banyak permintaan sampai `max_batch_size`
+    # baris terkumpul atau `max_wait` detik berlalu sejak baris pertama, lalu
+    # menjalankan satu prediksi tervektorisasi untuk semuanya.
+
+    def __init__(self, predict, max_batch_size=256, max_wait=0.002):
+        self.predict = predict
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.rows = 0
+        self._queue = asyncio.Queue()
+        self._worker = None
+
+    def start(self):
+        if self._worker is None:
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def submit(self, features):
+        features = np.asarray(features, dtype=float).reshape(-1, 2)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((features, future))
+        return await future
+
+    async def _collect(self):
+        items = [await self._queue.get()]
+        size = len(items[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            items.append(item)
+            size += len(item[0])
+        return items
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = await self._collect()
+            features = np.concatenate([item[0] for item in items])
+            start = time.perf_counter()
+            try:
+                # Prediksi dijalankan di thread lain agar batch berikutnya tetap bisa terkumpul
+                predictions = await loop.run_in_executor(None, self.predict, features)
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            tracing.record('server/batch_predict', time.perf_counter() - start, rows=len(features))
+            self.batches += 1
+            self.rows += len(features)
+            offset = 0
+            for rows, future in items:
+                if not future.done():
+                    future.set_result(predictions[offset:offset + len(rows)])
+                offset += len(rows)
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class PredictionService:
+    def __init__(self, predictor, recommender=None, max_batch_size=256, max_wait=0.002):
+        # `recommender` boleh berupa indeks langsung atau fungsi tanpa argumen yang
+        # mengembalikan indeks terkini (dipanggil per permintaan)
+        self.predictor = predictor
+        self._recommender = recommender
+        self.batcher = MicroBatcher(predictor.predict, max_batch_size, max_wait)
+
+    async def _predict_rows(self, rows):
+        rows = np.asarray(rows, dtype=object).reshape(-1, 2) if len(rows) else np.empty((0, 2))
+        rataan, sbaku, reasons = validate_scores(rows[:, 0], rows[:, 1])
+        invalid = np.flatnonzero(reasons != "")
+        if len(invalid):
+            raise HttpError(400, f"Baris {int(invalid[0])}: {reasons[invalid[0]]}")
+        return await self.batcher.submit(np.column_stack([rataan, sbaku]))
+
+    async def predict(self, payload):
+        if 'inputs' in payload:
+            try:
+                rows = list(payload['inputs'])
+            except TypeError:
+                raise HttpError(400, "'inputs' harus berupa daftar pasangan [RATAAN, S.BAKU]")
+            if any(not isinstance(row, (list, tuple)) or len(row) != 2 for row in rows):
+                raise HttpError(400, "'inputs' harus berupa daftar pasangan [RATAAN, S.BAKU]")
+            predictions = await self._predict_rows(rows)
+            return {'predictions': [round(float(p), 4) for p in predictions]}
+        predictions = await self._predict_rows([[payload.get('rataan'), payload.get('sbaku')]])
+        return {'prediction': round(float(predictions[0]), 4)}
+
+    @property
+    def recommender(self):
+        if callable(self._recommender):
+            return self._recommender()
+        return self._recommender
+
+    async def recommend(self, payload):
+        recommender = self.recommender
+        if recommender is None:
+            raise HttpError(503, "Dataset rekomendasi tidak tersedia")
+        method = payload.get('method', METHOD_MIN)
+        if method not in (METHOD_MIN, METHOD_PROFILE):
+            raise HttpError(400, f"'method' harus '{METHOD_MIN}' atau '{METHOD_PROFILE}'")
+        try:
+            k = int(payload.get('k', 5))
+        except (TypeError, ValueError):
+            raise HttpError(400, "'k' harus berupa bilangan bulat")
+        if not 1 <= k <= 100:
+            raise HttpError(400, "'k' harus di antara 1 dan 100")
+        for field in ('ptn', 'prodi'):
+            if payload.get(field) is not None and not isinstance(payload[field], str):
+                raise HttpError(400, f"'{field}' harus berupa teks")
+
+        rataan, sbaku = payload.get('rataan'), payload.get('sbaku')
+        predicted_min = float((await self._predict_rows([[rataan, sbaku]]))[0])
+        # Tabel lookup hanya tersedia bila prediktor menyediakannya (ReloadingPredictor)
+        lookup = getattr(self.predictor, 'lookup', None)
+        result, note = recommend(
+            recommender, predicted_min, k=k,
+            ptn=payload.get('ptn'), prodi=payload.get('prodi'), method=method,
+            rataan=float(rataan), sbaku=float(sbaku), lookup=lookup() if lookup is not None else None,
+        )
+        return {
+            'prediction': round(predicted_min, 4),
+            'note': note,
+            'recommendations': [
+                {'ptn': row['PTN'], 'prodi': row['NAMA PRODI'], 'min': float(row['MIN']),
+                 'selisih': round(float(row['selisih']), 4)}
+                for _, row in result.iterrows()
+            ],
+        }
+
+    async def handle(self, method, path, body):
+        if path == '/health' and method == 'GET':
+            return 200, {'status': 'ok', 'batches': self.batcher.batches, 'rows': self.batcher.rows}
+        routes = {'/predict': self.predict, '/recommend': self.recommend}
+        if path not in routes:
+            raise HttpError(404, "Endpoint tidak ditemukan")
+        if method != 'POST':
+            raise HttpError(405, "Gunakan metode POST")
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            raise HttpError(400, "Body bukan JSON yang valid")
+        if not isinstance(payload, dict):
+            raise HttpError(400, "Body harus berupa objek JSON")
+        return 200, await routes[path](payload)
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._write(writer, 400, {'error': "Permintaan tidak valid"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._write(writer, 400, {'error': "Content-Length tidak valid"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._write(writer, 413, {'error': "Body terlalu besar"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                path = target.split('?', 1)[0]
+                start = time.perf_counter()
+                try:
+                    status, response = await self.handle(method, path, body)
+                except HttpError as e:
+                    status, response = e.status, {'error': e.message}
+                except Exception as e:
+                    status, response = 500, {'error': f"Terjadi kesalahan: {e}"}
+                tracing.record(f'server/request{path}', time.perf_counter() - start, status=status)
+                await self._write(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _write(writer, status, payload, keep_alive):
+        reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                   413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+        body = json.dumps(payload).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {reasons.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def start(self, host='127.0.0.1', port=8600):
+        self.batcher.start()
+        return await asyncio.start_server(self.serve_connection, host, port)
+
+
+def build_service(model_path='Lasso_Regression.sav', poly_path='polynomial_features.sav',
+                  data_path='passing-grade.csv', max_batch_size=256, max_wait=0.002,
+                  artifact_path='Lasso_Regression.json'):
+    # Model, tabel grid, dan indeks rekomendasi diselesaikan lewat cache loader
+    # per permintaan, sehingga semuanya mengikuti versi file terbaru bersama-sama
+    def current_recommender():
+        try:
+            return load_recommender(data_path)
+        except FileNotFoundError:
+            return None
+
+    predictor = ReloadingPredictor(model_path, poly_path, artifact_path, data_path)
+    return PredictionService(predictor, current_recommender, max_batch_size, max_wait)
+
+
+async def _main(args):
+    service = build_service(args.model, args.poly, args.data, args.max_batch_size, args.max_wait_ms / 1000,
+                            args.artifact)
+    server = await service.start(args.host, args.port)
+    print(f"Melayani di http://{args.host}:{args.port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Layanan HTTP prediksi passing grade")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    parser.add_argument('--artifact', default='Lasso_Regression.json',
+                        help="Artefak terkompilasi (compiled.py); bila tidak ada, pakai file .sav")
+    parser.add_argument('--model', default='Lasso_Regression.sav')
+    parser.add_argument('--poly', default='polynomial_features.sav')
+    parser.add_argument('--data', default='passing-grade.csv')
+    parser.add_argument('--max-batch-size', type=int, default=256)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
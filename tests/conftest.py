@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Modul aplikasi berada di root repositori (bukan paket)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope='session')
+def training_data():
+    # (poly, X, y) seperti pelatihan: fitur polinomial derajat 2 dari RATAAN/S.BAKU dan target MIN
+    from sklearn.preprocessing import PolynomialFeatures
+
+    df = pd.read_csv(os.path.join(ROOT, 'passing-grade.csv')).dropna(subset=['RATAAN', 'S.BAKU', 'MIN'])
+    poly = PolynomialFeatures(degree=2, include_bias=False)
+    X = poly.fit_transform(df[['RATAAN', 'S.BAKU']].to_numpy())
+    return poly, X, df['MIN'].to_numpy()
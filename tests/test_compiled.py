@@ -0,0 +1,34 @@
+
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
+
+from compiled import compile_model, load_artifact
+
+MODELS = [
+    LinearRegression(),
+    Ridge(alpha=1.0),
+    Lasso(alpha=0.1),
+    RandomForestRegressor(n_estimators=10, random_state=42),
+    GradientBoostingRegressor(n_estimators=20, random_state=42),
+]
+
+
+GRID = np.stack(np.meshgrid(np.arange(801), np.arange(31), indexing='ij'), axis=-1).reshape(-1, 2).astype(float)
+
+
+@pytest.mark.parametrize('model', MODELS, ids=lambda model: type(model).__name__)
+def test_compiled_matches_sklearn(model, training_data, tmp_path):
+    poly, X, y = training_data
+    model.fit(X, y)
+    expected = model.predict(poly.transform(GRID))
+
+    compiled = compile_model(poly, model)
+    path = str(tmp_path / ('model.npz' if hasattr(model, 'estimators_') else 'model.json'))
+    compiled.save(path)
+    loaded = load_artifact(path)
+
+    np.testing.assert_allclose(loaded.predict(GRID), expected, rtol=0, atol=1e-9)
+    if hasattr(loaded, 'predict_one'):
+        assert loaded.predict_one(700, 20) == pytest.approx(expected[700 * 31 + 20], abs=1e-9)
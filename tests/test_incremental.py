@@ -0,0 +1,65 @@
+import multiprocessing
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
+
+from conftest import ROOT
+from incremental import IncrementalUpdater, RunningStats, solve
+
+
+def _stats_in_batches(X, y, sizes):
+    # Statistik yang dibangun dari beberapa batch berurutan, seperti pembaruan inkremental
+    stats = RunningStats.from_arrays(X[:0], y[:0])
+    for start, stop in zip(np.cumsum([0] + sizes[:-1]), np.cumsum(sizes)):
+        stats = stats.merge(RunningStats.from_arrays(X[start:stop], y[start:stop]))
+    return stats
+
+
+# Lasso: toleransi mengikuti batas konvergensi coordinate descent scikit-learn
+@pytest.mark.parametrize('name, alpha, estimator, atol', [
+    ('LinearRegression', 0.0, LinearRegression(), 1e-8),
+    ('Ridge', 1.0, Ridge(alpha=1.0), 1e-8),
+    ('Lasso', 0.1, Lasso(alpha=0.1, tol=1e-12, max_iter=1_000_000), 1e-6),
+])
+def test_incremental_solution_matches_sklearn(name, alpha, estimator, atol, training_data):
+    _, X, y = training_data
+    sizes = [200, 1, 150, len(y) - 351]
+    coef, intercept = solve(_stats_in_batches(X, y, sizes), name, alpha)
+
+    estimator.fit(X, y)
+    np.testing.assert_allclose(X @ coef + intercept, estimator.predict(X), rtol=0, atol=atol)
+
+
+def test_merged_stats_match_full_pass(training_data):
+    _, X, y = training_data
+    merged = _stats_in_batches(X, y, [1, 99, len(y) - 100])
+    full = RunningStats.from_arrays(X, y)
+    assert merged.n == full.n
+    np.testing.assert_allclose(merged.mean, full.mean, rtol=1e-12)
+    np.testing.assert_allclose(merged.comoment, full.comoment, rtol=1e-9)
+
+
+def _update_one(paths, rataan):
+    csv_path, artifact_path = paths
+    rows = pd.DataFrame({'RATAAN': [rataan], 'S.BAKU': [20.0], 'MIN': [650.0]})
+    return IncrementalUpdater(csv_path, artifact_path, refit_every=10**9).update(rows)['rows']
+
+
+def test_concurrent_updates_keep_every_batch(tmp_path):
+    # Pembaruan dari beberapa proses sekaligus: tidak ada batch yang hilang dari statistik
+    csv_path = str(tmp_path / 'passing-grade.csv')
+    artifact_path = str(tmp_path / 'model.json')
+    shutil.copy(os.path.join(ROOT, 'passing-grade.csv'), csv_path)
+    shutil.copy(os.path.join(ROOT, 'Lasso_Regression.json'), artifact_path)
+    IncrementalUpdater(csv_path, artifact_path).refit()
+
+    with multiprocessing.get_context('spawn').Pool(4) as pool:
+        added = pool.starmap(_update_one, [((csv_path, artifact_path), 600.0 + i) for i in range(8)])
+    status = IncrementalUpdater(csv_path, artifact_path).status()
+    assert sum(added) == 8
+    assert status['total_rows'] == len(pd.read_csv(csv_path).dropna(subset=['RATAAN', 'S.BAKU', 'MIN'])) + 8
+    assert status['rows_since_refit'] == 8
@@ -0,0 +1,53 @@
+import os
+
+import numpy as np
+import pytest
+
+from compiled import load_artifact
+from conftest import ROOT
+from core import recommend
+from loader import load_recommender
+from lookup import FALLBACK_CACHE_SIZE, LookupTable
+
+
+class CountingPredictor:
+    def __init__(self, predictor):
+        self.predictor = predictor
+        self.rows = 0
+
+    def predict(self, features):
+        self.rows += len(features)
+        return self.predictor.predict(features)
+
+
+@pytest.fixture(scope='module')
+def table():
+    predictor = CountingPredictor(load_artifact(os.path.join(ROOT, 'Lasso_Regression.json')))
+    return LookupTable(predictor, load_recommender(os.path.join(ROOT, 'passing-grade.csv')))
+
+
+def test_grid_matches_model(table):
+    features = np.array([[700, 20], [1, 1], [800, 30], [700.5, 20], [900, 20]], dtype=float)
+    np.testing.assert_allclose(table.predict(features), table.predictor.predictor.predict(features), atol=1e-9)
+    assert table.predict_one(700, 20) == table.predictions[700, 20]
+
+
+def test_off_grid_rows_are_memoized(table):
+    features = np.array([[650.25, 12.5], [700, 20], [610.75, 9.5]])
+    first = table.predict(features)
+    rows = table.predictor.rows
+    np.testing.assert_array_equal(table.predict(features), first)
+    assert table.predict_one(650.25, 12.5) == first[0]
+    assert table.predictor.rows == rows
+
+    # Batch besar di luar grid tidak melewati cache
+    large = np.column_stack([np.linspace(500.5, 700.5, FALLBACK_CACHE_SIZE + 1), np.full(FALLBACK_CACHE_SIZE + 1, 10.5)])
+    table.predict(large)
+    assert len(table._cache) <= FALLBACK_CACHE_SIZE
+
+
+def test_recommendations_match_index(table):
+    predicted_min = table.predict_one(700, 20)
+    from_table, _ = recommend(table.recommender, predicted_min, k=5, rataan=700, sbaku=20, lookup=table)
+    from_index, _ = recommend(table.recommender, predicted_min, k=5, rataan=700, sbaku=20)
+    assert from_table.equals(from_index)
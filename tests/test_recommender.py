@@ -0,0 +1,100 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+from recommender import RecommendationIndex, SortedMinIndex, normalize_name
+
+
+@pytest.fixture(scope='module')
+def frames():
+    real = pd.read_csv(os.path.join(ROOT, 'passing-grade.csv'))
+    # Data sintetis dengan banyak MIN kembar dan nama yang saling mengandung
+    rng = np.random.default_rng(0)
+    n = 300
+    synthetic = pd.DataFrame({
+        'PTN': rng.choice(['UNIVERSITAS A', 'UNIVERSITAS AB', 'institut  b'], n),
+        'NAMA PRODI': rng.choice(['TEKNIK', 'TEKNIK SIPIL', 'HUKUM', 'Kedokteran'], n),
+        'RATAAN': rng.integers(500, 750, n).astype(float),
+        'S.BAKU': rng.integers(5, 25, n).astype(float),
+        'MIN': rng.integers(550, 560, n).astype(float),
+    })
+    synthetic.loc[::17, 'MIN'] = np.nan
+    return {'real': real, 'synthetic': synthetic}
+
+
+def _matching_keys(query, keys):
+    # Aturan pencocokan RecommendationIndex: persis dulu, lalu substring
+    query = normalize_name(query)
+    if query in keys:
+        return {query}
+    return {key for key in keys if query in key}
+
+
+def _brute_force(df, target, k, ptn=None, prodi=None):
+    # abs(MIN - x).nsmallest(k) atas baris yang lolos filter
+    mask = df['MIN'].notna()
+    for column, query in (('PTN', ptn), ('NAMA PRODI', prodi)):
+        if query:
+            names = df[column].map(normalize_name)
+            mask &= names.isin(_matching_keys(query, set(names[df['MIN'].notna()])))
+    return mask.to_numpy(), (df.loc[mask, 'MIN'] - target).abs().nsmallest(k).to_numpy()
+
+
+def _assert_brute_force(df, target, k, positions, distances, ptn=None, prodi=None):
+    # Urutan baris dengan selisih kembar boleh berbeda; selisihnya harus sama
+    # persis dan setiap baris yang dikembalikan harus unik dan lolos filter
+    mask, expected = _brute_force(df, target, k, ptn, prodi)
+    np.testing.assert_array_equal(distances, expected)
+    np.testing.assert_array_equal(np.abs(df['MIN'].to_numpy()[positions] - target), distances)
+    assert mask[positions].all()
+    assert len(set(positions.tolist())) == len(positions)
+
+
+TARGETS = [-1e6, 0.0, 554.0, 554.5, 581.92, 650.0, 700.123, 1e6]
+KS = [1, 3, 10, 1000]
+
+
+@pytest.mark.parametrize('name', ['real', 'synthetic'])
+@pytest.mark.parametrize('k', KS)
+def test_nearest_matches_brute_force(frames, name, k):
+    df = frames[name]
+    valid = df['MIN'].notna().to_numpy()
+    index = SortedMinIndex(np.flatnonzero(valid), df['MIN'].to_numpy()[valid])
+    for target in TARGETS:
+        _assert_brute_force(df, target, k, *index.nearest(target, k))
+
+    positions, distances = index.nearest_many(TARGETS, k)
+    assert positions.shape == (len(TARGETS), min(k, valid.sum()))
+    for row, target in enumerate(TARGETS):
+        _assert_brute_force(df, target, k, positions[row], distances[row])
+
+
+@pytest.mark.parametrize('ptn, prodi', [
+    ('UNIVERSITAS A', None),
+    ('universitas', None),
+    ('INSTITUT B', 'teknik'),
+    (None, 'TEKNIK'),
+    (None, 'SIPIL'),
+    ('TIDAK ADA', None),
+])
+@pytest.mark.parametrize('k', KS)
+def test_filtered_nearest_min_matches_brute_force(frames, ptn, prodi, k):
+    df = frames['synthetic']
+    index = RecommendationIndex(df)
+    for target in TARGETS:
+        result = index.nearest_min(target, k, ptn=ptn, prodi=prodi)
+        _assert_brute_force(df, target, k, result.index.to_numpy(), result['selisih'].to_numpy(), ptn, prodi)
+
+
+def test_filtered_nearest_min_on_dataset(frames):
+    df = frames['real']
+    index = RecommendationIndex(df)
+    ptn, prodi = df['PTN'].iloc[0], df['NAMA PRODI'].iloc[0]
+    for query_ptn, query_prodi in [(ptn, None), (None, prodi), (ptn, prodi), ('UNIVERSITAS', None)]:
+        for target in TARGETS:
+            result = index.nearest_min(target, 10, ptn=query_ptn, prodi=query_prodi)
+            _assert_brute_force(df, target, 10, result.index.to_numpy(), result['selisih'].to_numpy(),
+                                query_ptn, query_prodi)
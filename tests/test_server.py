@@ -0,0 +1,86 @@
+import asyncio
+import json
+import os
+
+from conftest import ROOT
+from loader import load_compiled, load_recommender
+from server import PredictionService, build_service
+
+
+def _service(max_wait=0.02):
+    return build_service(
+        model_path=os.path.join(ROOT, 'Lasso_Regression.sav'),
+        poly_path=os.path.join(ROOT, 'polynomial_features.sav'),
+        data_path=os.path.join(ROOT, 'passing-grade.csv'),
+        artifact_path=os.path.join(ROOT, 'Lasso_Regression.json'),
+        max_wait=max_wait,
+    )
+
+
+async def _request(port, method, path, body=b'', headers=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    head = f"{method} {path} HTTP/1.1\r\nConnection: close\r\n"
+    for name, value in (headers or {'Content-Length': str(len(body))}).items():
+        head += f"{name}: {value}\r\n"
+    writer.write(head.encode('latin-1') + b"\r\n" + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    status_line, _, rest = response.partition(b"\r\n")
+    return int(status_line.split()[1]), json.loads(rest.partition(b"\r\n\r\n")[2])
+
+
+def _run(scenario):
+    async def main():
+        service = _service()
+        server = await service.start(port=0)
+        try:
+            return await scenario(service, server.sockets[0].getsockname()[1])
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.batcher.stop()
+    return asyncio.run(main())
+
+
+def test_concurrent_predictions_are_batched():
+    async def scenario(service, port):
+        body = json.dumps({'rataan': 700, 'sbaku': 20}).encode()
+        return await asyncio.gather(*[_request(port, 'POST', '/predict', body) for _ in range(50)]), service
+
+    responses, service = _run(scenario)
+    assert all(status == 200 for status, _ in responses)
+    assert len({payload['prediction'] for _, payload in responses}) == 1
+    assert service.batcher.batches < len(responses)
+
+
+def test_error_responses():
+    async def scenario(service, port):
+        return [
+            await _request(port, 'POST', '/predict', b'bukan json'),
+            await _request(port, 'POST', '/predict', json.dumps({'rataan': 900, 'sbaku': 20}).encode()),
+            await _request(port, 'POST', '/predict', headers={'Content-Length': 'abc'}),
+            await _request(port, 'POST', '/predict', headers={'Content-Length': '-1'}),
+            await _request(port, 'POST', '/recommend', json.dumps({'rataan': 700, 'sbaku': 20, 'ptn': 5}).encode()),
+            await _request(port, 'POST', '/recommend', json.dumps({'rataan': 700, 'sbaku': 20, 'prodi': ['x']}).encode()),
+            await _request(port, 'GET', '/tidak-ada'),
+        ]
+
+    statuses = [status for status, _ in _run(scenario)]
+    assert statuses == [400, 400, 400, 400, 400, 400, 404]
+
+
+def test_recommend_without_lookup_table():
+    # Prediktor tanpa tabel lookup (mis. artefak compiled langsung) tetap bisa memberi rekomendasi
+    async def main():
+        service = PredictionService(
+            load_compiled(os.path.join(ROOT, 'Lasso_Regression.json')),
+            load_recommender(os.path.join(ROOT, 'passing-grade.csv')),
+        )
+        service.batcher.start()
+        try:
+            return await service.recommend({'rataan': 700, 'sbaku': 20, 'k': 3})
+        finally:
+            await service.batcher.stop()
+
+    assert len(asyncio.run(main())['recommendations']) == 3
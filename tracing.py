@@ -0,0 +1,152 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Span waktu ringan untuk jalur panas (parsing CSV, unpickle, poly.transform,
+# model.predict, rekomendasi, serialisasi grafik, render halaman).
+#
+#   PASSING_GRADE_TRACE=1                   aktifkan pengukuran
+#   PASSING_GRADE_TRACE_FILE=trace.jsonl    tulis setiap span sebagai JSON-lines
+#   PASSING_GRADE_DEBUG=1                   aktifkan pengukuran + panel debug di sidebar
+#
+# Saat nonaktif, span() mengembalikan objek no-op bersama sehingga biayanya
+# hanya satu pengecekan boolean.
+#
+#   python tracing.py trace.jsonl           ringkasan p50/p95/p99 per tahap
+
+MAX_SAMPLES = 10000
+
+debug = os.environ.get('PASSING_GRADE_DEBUG', '') not in ('', '0')
+enabled = debug or os.environ.get('PASSING_GRADE_TRACE', '') not in ('', '0')
+export_path = os.environ.get('PASSING_GRADE_TRACE_FILE') or None
+enabled = enabled or export_path is not None
+
+_lock = threading.Lock()
+_samples = {}
+_local = threading.local()
+_export_file = None
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ('stage', 'attrs', 'start')
+
+    def __init__(self, stage, attrs):
+        self.stage = stage
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.stage, time.perf_counter() - self.start, **self.attrs)
+        return False
+
+
+def span(stage, **attrs):
+    if not enabled:
+        return _NOOP
+    return _Span(stage, attrs)
+
+
+def record(stage, seconds, **attrs):
+    if not enabled:
+        return
+    with _lock:
+        samples = _samples.get(stage)
+        if samples is None:
+            samples = _samples[stage] = deque(maxlen=MAX_SAMPLES)
+        samples.append(seconds)
+        if export_path is not None:
+            _export({'ts': time.time(), 'pid': os.getpid(), 'stage': stage, 'ms': seconds * 1000, **attrs})
+    collector = getattr(_local, 'collector', None)
+    if collector is not None:
+        collector.append((stage, seconds * 1000))
+
+
+def _export(event):
+    global _export_file
+    if _export_file is None:
+        _export_file = open(export_path, 'a', buffering=1)
+    _export_file.write(json.dumps(event) + '\n')
+
+
+def set_collector(collector):
+    # Span yang tercatat di thread ini juga ditambahkan ke `collector`
+    # (mis. deque di st.session_state untuk timing per sesi)
+    _local.collector = collector
+
+
+def enable(flag=True, path=None):
+    global enabled, export_path, _export_file
+    with _lock:
+        enabled = flag
+        if path != export_path and _export_file is not None:
+            _export_file.close()
+            _export_file = None
+        export_path = path
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def summarize(samples):
+    # {tahap: [durasi_ms, ...]} -> {tahap: {count, mean_ms, p50_ms, p95_ms, p99_ms}}
+    summary = {}
+    for stage, values in sorted(samples.items()):
+        values = sorted(values)
+        summary[stage] = {
+            'count': len(values),
+            'mean_ms': sum(values) / len(values) if values else 0.0,
+            'p50_ms': _percentile(values, 50),
+            'p95_ms': _percentile(values, 95),
+            'p99_ms': _percentile(values, 99),
+        }
+    return summary
+
+
+def aggregates():
+    # Agregat proses ini untuk setiap tahap
+    with _lock:
+        samples = {stage: [s * 1000 for s in values] for stage, values in _samples.items()}
+    return summarize(samples)
+
+
+def read_jsonl(path):
+    samples = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                event = json.loads(line)
+                samples.setdefault(event['stage'], []).append(event['ms'])
+    return summarize(samples)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ringkasan p50/p95/p99 dari file trace JSON-lines")
+    parser.add_argument('path')
+    args = parser.parse_args()
+    print(f"{'tahap':40} {'n':>7} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+    for stage, s in read_jsonl(args.path).items():
+        print(f"{stage:40} {s['count']:>7} {s['p50_ms']:>10.3f} {s['p95_ms']:>10.3f} {s['p99_ms']:>10.3f}")
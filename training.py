@@ -0,0 +1,229 @@
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Pipeline pelatihan untuk halaman Modelling. Setiap pasangan (model, fold)
+# dilatih sebagai satu tugas di process pool; matriks fitur polinomial dihitung
+# sekali di proses utama lalu dibagikan ke worker lewat shared memory.
+
+MODEL_NAMES = [
+    "Linear Regression",
+    "Ridge Regression",
+    "Lasso Regression",
+    "Random Forest Regressor",
+    "Gradient Boosting Regressor",
+]
+
+# Model yang bisa memakai beberapa core sendiri (n_jobs)
+PARALLEL_MODELS = {"Random Forest Regressor"}
+
+# Kekuatan regularisasi model linear (juga dipakai incremental.py)
+MODEL_ALPHAS = {"Ridge Regression": 1.0, "Lasso Regression": 0.1}
+
+
+def build_model(name, n_jobs=1):
+    if name == "Linear Regression":
+        from sklearn.linear_model import LinearRegression
+        return LinearRegression()
+    if name == "Ridge Regression":
+        from sklearn.linear_model import Ridge
+        return Ridge(alpha=MODEL_ALPHAS["Ridge Regression"])
+    if name == "Lasso Regression":
+        from sklearn.linear_model import Lasso
+        return Lasso(alpha=MODEL_ALPHAS["Lasso Regression"])
+    if name == "Random Forest Regressor":
+        from sklearn.ensemble import RandomForestRegressor
+        return RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=n_jobs)
+    if name == "Gradient Boosting Regressor":
+        from sklearn.ensemble import GradientBoostingRegressor
+        return GradientBoostingRegressor(n_estimators=100, random_state=42)
+    raise ValueError(f"Model tidak dikenal: {name}")
+
+
+def plan_workers(n_tasks, max_workers=None):
+    # Membagi core antara jumlah worker pool dan n_jobs di dalam model
+    # sehingga worker x n_jobs tidak melebihi jumlah core.
+    cores = os.cpu_count() or 1
+    workers = max(1, min(n_tasks, max_workers or cores, cores))
+    return workers, max(1, cores // workers)
+
+
+# Diisi oleh _init_worker di setiap proses worker
+_shared = {}
+
+
+def _to_shared(array):
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block
+
+
+def _init_worker(x_name, x_shape, y_name, y_shape):
+    x_block = shared_memory.SharedMemory(name=x_name)
+    y_block = shared_memory.SharedMemory(name=y_name)
+    _shared['blocks'] = (x_block, y_block)
+    _shared['X'] = np.ndarray(x_shape, dtype=np.float64, buffer=x_block.buf)
+    _shared['y'] = np.ndarray(y_shape, dtype=np.float64, buffer=y_block.buf)
+    # Import scikit-learn di sini agar biayanya tidak terhitung ke model yang kebetulan jalan pertama
+    import sklearn.ensemble
+    import sklearn.linear_model
+
+
+def _fit_fold(name, fold, train_idx, test_idx, n_jobs):
+    X, y = _shared['X'], _shared['y']
+    started_at, cpu_start = time.time(), time.process_time()
+    model = build_model(name, n_jobs)
+    model.fit(X[train_idx], y[train_idx])
+    y_pred = model.predict(X[test_idx])
+    mse = float(np.mean((y[test_idx] - y_pred) ** 2))
+    return {
+        'name': name,
+        'fold': fold,
+        'mse': mse,
+        # Jam dinding (time.time) agar bisa dibandingkan antar proses worker
+        'started_at': started_at,
+        'finished_at': time.time(),
+        'cpu_seconds': time.process_time() - cpu_start,
+    }
+
+
+def kfold_indices(n, n_folds=5, random_state=42):
+    order = np.random.RandomState(random_state).permutation(n)
+    folds = np.array_split(order, n_folds)
+    for i, test_idx in enumerate(folds):
+        train_idx = np.concatenate([f for j, f in enumerate(folds) if j != i])
+        yield i, train_idx, test_idx
+
+
+class TrainingJob:
+    # Menjalankan pelatihan di thread latar belakang agar sesi Streamlit tidak
+    # terkunci; halaman cukup membaca `progress()` di setiap rerun.
+
+    def __init__(self, df, n_folds=5, max_workers=None,
+                 model_path='passing_grade_model.sav', poly_path='polynomial_features.sav'):
+        self.df = df
+        self.n_folds = n_folds
+        self.max_workers = max_workers
+        self.model_path = model_path
+        self.poly_path = poly_path
+        self.results = {name: [] for name in MODEL_NAMES}
+        self.best_model_name = None
+        self.artifact_path = None
+        self.error = None
+        self.done = False
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+        return self.done
+
+    def progress(self):
+        # Ringkasan per model: fold selesai, rata-rata MSE CV, waktu wall dan CPU
+        with self._lock:
+            summary = {}
+            for name, folds in self.results.items():
+                summary[name] = {
+                    'folds_done': len(folds),
+                    'n_folds': self.n_folds,
+                    'mse': float(np.mean([f['mse'] for f in folds])) if folds else None,
+                    # Fold berjalan paralel: wall = mulai fold pertama s.d. selesai fold terakhir
+                    'wall_seconds': (max(f['finished_at'] for f in folds) - min(f['started_at'] for f in folds))
+                    if folds else 0.0,
+                    'cpu_seconds': sum(f['cpu_seconds'] for f in folds),
+                }
+            return summary
+
+    def fraction_done(self):
+        with self._lock:
+            completed = sum(len(folds) for folds in self.results.values())
+        return completed / (len(MODEL_NAMES) * self.n_folds)
+
+    def elapsed(self):
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at if self.started_at is not None else 0.0
+
+    def _run(self):
+        try:
+            self._train()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished_at = time.perf_counter()
+            self.done = True
+
+    def _train(self):
+        from sklearn.preprocessing import PolynomialFeatures
+
+        poly = PolynomialFeatures(degree=2, include_bias=False)
+        X_poly = np.ascontiguousarray(poly.fit_transform(self.df[['RATAAN', 'S.BAKU']]), dtype=np.float64)
+        y = np.ascontiguousarray(self.df['MIN'].to_numpy(), dtype=np.float64)
+
+        folds = list(kfold_indices(len(y), self.n_folds))
+        workers, inner_jobs = plan_workers(len(MODEL_NAMES) * len(folds), self.max_workers)
+
+        x_block, y_block = _to_shared(X_poly), _to_shared(y)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(x_block.name, X_poly.shape, y_block.name, y.shape),
+            ) as pool:
+                futures = [
+                    pool.submit(_fit_fold, name, fold, train_idx, test_idx,
+                                inner_jobs if name in PARALLEL_MODELS else 1)
+                    for name in MODEL_NAMES
+                    for fold, train_idx, test_idx in folds
+                ]
+                for future in as_completed(futures):
+                    result = future.result()
+                    with self._lock:
+                        self.results[result['name']].append(result)
+        finally:
+            x_block.close()
+            x_block.unlink()
+            y_block.close()
+            y_block.unlink()
+
+        # Model terbaik menurut rata-rata MSE CV dilatih ulang di seluruh data lalu disimpan
+        summary = self.progress()
+        self.best_model_name = min(MODEL_NAMES, key=lambda name: summary[name]['mse'])
+        best_model = build_model(self.best_model_name, os.cpu_count() or 1)
+        best_model.fit(X_poly, y)
+        if self.best_model_name in PARALLEL_MODELS:
+            best_model.set_params(n_jobs=None)
+
+        _dump_atomic(best_model, self.model_path)
+        _dump_atomic(poly, self.poly_path)
+
+        # Artefak tanpa pickle untuk serving (compiled.py)
+        from compiled import artifact_path_for, compile_model
+        compiled = compile_model(poly, best_model)
+        self.artifact_path = artifact_path_for(self.model_path, compiled)
+        tmp_path = f"{self.artifact_path}.tmp"
+        compiled.save(tmp_path)
+        os.replace(tmp_path, self.artifact_path)
+
+
+def _dump_atomic(obj, path):
+    # Ditulis ke file sementara lalu diganti sekaligus, agar sesi lain yang sedang
+    # memuat model tidak membaca file yang setengah jadi
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(obj, f)
+    os.replace(tmp_path, path)